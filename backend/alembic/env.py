@@ -1,6 +1,7 @@
 from dotenv import load_dotenv
 import os
 from app.db.base import Base
+from app.db.index_check import unindexed_foreign_keys
 import app.models  # Import all models to register them with Base.metadata
 
 from logging.config import fileConfig
@@ -25,7 +26,8 @@ config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # keep the app's loggers working when migrations run in-process (tests, benchmarks)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -39,6 +41,12 @@ target_metadata = Base.metadata # include all models' metadata
 # ... etc.
 
 
+def warn_unindexed_foreign_keys(migration_context, revision, directives) -> None:
+    # Runs on `alembic revision --autogenerate`, i.e. right after models changed
+    for problem in unindexed_foreign_keys(target_metadata):
+        print(f"  WARNING: unindexed foreign key {problem}, add index=True to the column")
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -78,7 +86,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection, 
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            process_revision_directives=warn_unindexed_foreign_keys,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,99 @@
+"""refresh search vector per statement
+
+Revision ID: a1d4e7c9b263
+Revises: f5b2d8e1a9c3
+Create Date: 2026-10-17 19:12:08.441902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d4e7c9b263'
+down_revision: Union[str, Sequence[str], None] = 'f5b2d8e1a9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The FOR EACH ROW trigger rebuilt the whole document and rewrote the
+# opportunity (and its GIN entry) once per requirement row, so writing n
+# requirements cost O(n^2). Statement triggers see every changed row at once
+# (transition tables) and refresh each affected opportunity exactly once.
+# Transition tables need one trigger per event, the function is shared.
+STATEMENT_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_requirements_search_vector_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE opportunities o
+        SET search_vector = opportunity_search_document(o.id, o.title, o.description)
+        WHERE o.id IN (SELECT DISTINCT opportunity_id FROM new_requirements);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE opportunities o
+        SET search_vector = opportunity_search_document(o.id, o.title, o.description)
+        WHERE o.id IN (SELECT DISTINCT opportunity_id FROM old_requirements);
+    ELSE
+        UPDATE opportunities o
+        SET search_vector = opportunity_search_document(o.id, o.title, o.description)
+        WHERE o.id IN (
+            SELECT opportunity_id FROM new_requirements
+            UNION
+            SELECT opportunity_id FROM old_requirements
+        );
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# the row-level version from b71d2c5e9f03, restored on downgrade
+ROW_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_requirements_search_vector_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE opportunities o
+    SET search_vector = opportunity_search_document(o.id, o.title, o.description)
+    WHERE o.id = COALESCE(NEW.opportunity_id, OLD.opportunity_id);
+    RETURN NULL;
+END
+$$
+"""
+
+# (trigger name suffix, event, transition tables)
+STATEMENT_TRIGGERS = [
+    ('insert', 'INSERT', 'NEW TABLE AS new_requirements'),
+    ('update', 'UPDATE', 'NEW TABLE AS new_requirements OLD TABLE AS old_requirements'),
+    ('delete', 'DELETE', 'OLD TABLE AS old_requirements'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS opportunity_requirements_search_vector ON opportunity_requirements')
+    op.execute('DROP FUNCTION IF EXISTS opportunity_requirements_search_vector_trigger()')
+
+    op.execute(STATEMENT_TRIGGER_FUNCTION)
+    for suffix, event, tables in STATEMENT_TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER opportunity_requirements_search_vector_{suffix}
+            AFTER {event} ON opportunity_requirements
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION opportunity_requirements_search_vector_refresh()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for suffix, _, _ in reversed(STATEMENT_TRIGGERS):
+        op.execute(f'DROP TRIGGER IF EXISTS opportunity_requirements_search_vector_{suffix} ON opportunity_requirements')
+    op.execute('DROP FUNCTION IF EXISTS opportunity_requirements_search_vector_refresh()')
+
+    op.execute(ROW_TRIGGER_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER opportunity_requirements_search_vector
+        AFTER INSERT OR UPDATE OR DELETE ON opportunity_requirements
+        FOR EACH ROW EXECUTE FUNCTION opportunity_requirements_search_vector_trigger()
+    """)
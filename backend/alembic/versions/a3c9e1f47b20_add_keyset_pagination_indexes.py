@@ -0,0 +1,43 @@
+"""add keyset pagination indexes
+
+Revision ID: a3c9e1f47b20
+Revises: 308fda524b8c
+Create Date: 2026-10-17 10:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f47b20'
+down_revision: Union[str, Sequence[str], None] = '308fda524b8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (created_at, id) indexes used by the cursor-paginated list endpoints
+KEYSET_TABLES = [
+    'services',
+    'projects',
+    'opportunities',
+    'members',
+    'mentors',
+    'trainings',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in KEYSET_TABLES:
+        op.create_index(f'ix_{table}_created_at_id', table, ['created_at', 'id'], unique=False)
+    op.create_index('ix_project_feedbacks_project_id_created_at_id', 'project_feedbacks', ['project_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_feedbacks_project_id_created_at_id', table_name='project_feedbacks')
+    for table in reversed(KEYSET_TABLES):
+        op.drop_index(f'ix_{table}_created_at_id', table_name=table)
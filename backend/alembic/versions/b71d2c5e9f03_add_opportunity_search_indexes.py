@@ -0,0 +1,105 @@
+"""add opportunity search indexes
+
+Revision ID: b71d2c5e9f03
+Revises: a3c9e1f47b20
+Create Date: 2026-10-17 11:03:27.581944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71d2c5e9f03'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e1f47b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Builds the search document of one opportunity:
+# title (weight A), description (B), requirements (C)
+SEARCH_DOCUMENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_search_document(
+    opportunity_id uuid, title text, description text
+) RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(r.text, ' ')
+            FROM opportunity_requirements r
+            WHERE r.opportunity_id = opportunity_search_document.opportunity_id
+        ), '')), 'C')
+$$
+"""
+
+# Opportunity row inserted or title/description changed
+OPPORTUNITY_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunities_search_vector_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := opportunity_search_document(NEW.id, NEW.title, NEW.description);
+    RETURN NEW;
+END
+$$
+"""
+
+# Requirement added, edited or removed -> refresh the parent opportunity
+REQUIREMENT_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_requirements_search_vector_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE opportunities o
+    SET search_vector = opportunity_search_document(o.id, o.title, o.description)
+    WHERE o.id = COALESCE(NEW.opportunity_id, OLD.opportunity_id);
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column('opportunities', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute(SEARCH_DOCUMENT_FUNCTION)
+    op.execute(OPPORTUNITY_TRIGGER_FUNCTION)
+    op.execute(REQUIREMENT_TRIGGER_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER opportunities_search_vector
+        BEFORE INSERT OR UPDATE OF title, description ON opportunities
+        FOR EACH ROW EXECUTE FUNCTION opportunities_search_vector_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER opportunity_requirements_search_vector
+        AFTER INSERT OR UPDATE OR DELETE ON opportunity_requirements
+        FOR EACH ROW EXECUTE FUNCTION opportunity_requirements_search_vector_trigger()
+    """)
+
+    # Backfill existing rows
+    op.execute('UPDATE opportunities SET search_vector = opportunity_search_document(id, title, description)')
+
+    op.create_index('ix_opportunities_search_vector', 'opportunities', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_opportunities_title_trgm', 'opportunities', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_opportunities_location_trgm', 'opportunities', ['location'], unique=False, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_opportunities_location_trgm', table_name='opportunities')
+    op.drop_index('ix_opportunities_title_trgm', table_name='opportunities')
+    op.drop_index('ix_opportunities_search_vector', table_name='opportunities')
+
+    op.execute('DROP TRIGGER IF EXISTS opportunity_requirements_search_vector ON opportunity_requirements')
+    op.execute('DROP TRIGGER IF EXISTS opportunities_search_vector ON opportunities')
+    op.execute('DROP FUNCTION IF EXISTS opportunity_requirements_search_vector_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS opportunities_search_vector_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS opportunity_search_document(uuid, text, text)')
+
+    op.drop_column('opportunities', 'search_vector')
+    # pg_trgm is left installed, other objects may use it
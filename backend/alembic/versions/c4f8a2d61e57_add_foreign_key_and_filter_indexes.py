@@ -0,0 +1,54 @@
+"""add foreign key and filter indexes
+
+Revision ID: c4f8a2d61e57
+Revises: b71d2c5e9f03
+Create Date: 2026-10-17 15:36:08.771903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2d61e57'
+down_revision: Union[str, Sequence[str], None] = 'b71d2c5e9f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) for every foreign key that is not already the leading
+# column of a primary key or index. Already covered, so not repeated here:
+#   service_tech_map.service_id, service_offering_map.service_id,
+#   project_tech_map.project_id, training_mentors.training_id  -> primary keys
+#   project_feedbacks.project_id -> ix_project_feedbacks_project_id_created_at_id
+FOREIGN_KEY_COLUMNS = [
+    ('opportunity_requirements', 'opportunity_id'),
+    ('training_benefits', 'training_id'),
+    ('service_tech_map', 'tech_id'),
+    ('service_offering_map', 'offering_id'),
+    ('project_tech_map', 'tech_id'),
+    ('training_mentors', 'mentor_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY does not lock the tables against writes, but it cannot run
+    # inside a transaction. if_not_exists lets a failed run be retried.
+    with op.get_context().autocommit_block():
+        for table, column in FOREIGN_KEY_COLUMNS:
+            op.create_index(f'ix_{table}_{column}', table, [column], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+        # /admin/members/teams and /interns: visible members of one role,
+        # newest first. Hidden members are never listed by role.
+        op.create_index('ix_members_visible_role_created_at_id', 'members', ['role', 'created_at', 'id'], unique=False, postgresql_where=sa.text('is_visible'), postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_members_visible_role_created_at_id', table_name='members', postgresql_concurrently=True, if_exists=True)
+        for table, column in reversed(FOREIGN_KEY_COLUMNS):
+            op.drop_index(f'ix_{table}_{column}', table_name=table, postgresql_concurrently=True, if_exists=True)
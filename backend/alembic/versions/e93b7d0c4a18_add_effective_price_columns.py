@@ -0,0 +1,46 @@
+"""add effective price columns
+
+Revision ID: e93b7d0c4a18
+Revises: c4f8a2d61e57
+Create Date: 2026-10-17 16:48:22.305617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b7d0c4a18'
+down_revision: Union[str, Sequence[str], None] = 'c4f8a2d61e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same rule as app/models/pricing/price.py (copied: migrations must not change
+# when the app code does)
+EFFECTIVE_PRICE_SQL = (
+    "GREATEST(0, ROUND(CASE"
+    " WHEN discount_type IS NULL OR discount_value IS NULL THEN base_price"
+    " WHEN discount_type = 'PERCENTAGE' THEN base_price * (1 - discount_value / 100)"
+    " ELSE base_price - discount_value"
+    " END, 2))"
+)
+
+PRICED_TABLES = ['services', 'trainings']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in PRICED_TABLES:
+        # generated column: existing rows are computed while the column is added
+        op.add_column(table, sa.Column('effective_price', sa.Numeric(precision=10, scale=2), sa.Computed(EFFECTIVE_PRICE_SQL, persisted=True), nullable=False))
+        op.create_index(f'ix_{table}_effective_price_id', table, ['effective_price', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(PRICED_TABLES):
+        op.drop_index(f'ix_{table}_effective_price_id', table_name=table)
+        op.drop_column(table, 'effective_price')
@@ -0,0 +1,34 @@
+"""order mentor pages by name
+
+Revision ID: f5b2d8e1a9c3
+Revises: e93b7d0c4a18
+Create Date: 2026-10-17 18:05:41.527390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b2d8e1a9c3'
+down_revision: Union[str, Sequence[str], None] = 'e93b7d0c4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /admin/mentors pages are now ordered like the full list: by name, then
+    # id (keyset on (name, id)), so the created_at index has no user left.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_mentors_name_id', 'mentors', ['name', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_mentors_created_at_id', table_name='mentors', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_mentors_created_at_id', 'mentors', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_mentors_name_id', table_name='mentors', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,90 @@
+# In-process cache of authenticated admins (principals)
+# get_current_user runs on every authenticated request, so without this cache
+# each request pays one AdminUser SELECT just to confirm the user still exists.
+# We keep a small snapshot of the user (no password hash) keyed by the token
+# subject (email) for a short time, and drop it as soon as the admin row changes.
+#
+# Limit: the drop only happens for ORM changes made by THIS process (hooks at
+# the bottom). An admin deactivated with SQL, from the Supabase dashboard or
+# by another worker keeps read access until their entry expires
+# (PRINCIPAL_CACHE_TTL_SECONDS, keep it short). Writes are not affected:
+# get_current_user never uses the cache for POST/PUT/PATCH/DELETE.
+
+from threading import Lock
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+
+from app.config import PRINCIPAL_CACHE_MAXSIZE, PRINCIPAL_CACHE_TTL_SECONDS
+from app.models.login_model import AdminUser
+
+# Bounded: at most PRINCIPAL_CACHE_MAXSIZE admins, each kept for TTL seconds
+_principals: TTLCache = TTLCache(
+    maxsize=PRINCIPAL_CACHE_MAXSIZE,
+    ttl=PRINCIPAL_CACHE_TTL_SECONDS,
+)
+_lock = Lock()  # routes run in a threadpool, TTLCache is not thread-safe
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def get_principal(email: str) -> AdminUser | None:
+    with _lock:
+        user = _principals.get(email)
+        if user is None:
+            _stats["misses"] += 1
+        else:
+            _stats["hits"] += 1
+        return user
+
+
+def set_principal(user: AdminUser) -> None:
+    # Store a detached copy so the cached object never touches a closed session
+    snapshot = AdminUser(
+        id=user.id,
+        email=user.email,
+        is_active=user.is_active,
+        role=user.role,
+    )
+    with _lock:
+        _principals[user.email] = snapshot
+
+
+def invalidate_principal(email: str) -> None:
+    with _lock:
+        if _principals.pop(email, None) is not None:
+            _stats["invalidations"] += 1
+
+
+def principal_cache_stats() -> dict:
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "size": len(_principals),
+            "maxsize": _principals.maxsize,
+            "ttl_seconds": _principals.ttl,
+            "hit_ratio": _stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+# ---------- invalidation hooks ----------
+# Any flush that deactivates an admin, changes their role or email,
+# or deletes them removes the cached principal right away.
+@event.listens_for(AdminUser, "after_update")
+def _invalidate_on_update(mapper, connection, target: AdminUser):
+    state = inspect(target)
+    if not any(
+        state.attrs[field].history.has_changes()
+        for field in ("is_active", "role", "email")
+    ):
+        return
+
+    # drop the current email and, if it was renamed, the old one too
+    invalidate_principal(target.email)
+    for old_email in state.attrs["email"].history.deleted:
+        if old_email:
+            invalidate_principal(old_email)
+
+
+@event.listens_for(AdminUser, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: AdminUser):
+    invalidate_principal(target.email)
@@ -1,14 +1,19 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.jwt import decode_access_token
 from jose import JWTError
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.login_model import AdminUser
+from app.auth.cache import get_principal, set_principal
 
 security = HTTPBearer(auto_error=False)
 
+# Requests that only read; everything else re-checks the admin in the DB
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
 ) -> AdminUser:
@@ -39,20 +44,29 @@ def get_current_user(
             detail="Invalid or missing claims in token"
         )
     
-    #  Load user from db (source of truth)
-    user = db.query(AdminUser).filter(AdminUser.email == email).first()
+    # Reuse the cached principal if we resolved this user recently.
+    # Writes always load the row: a deactivation done outside this process
+    # (SQL, another worker) is not seen by the cache until it expires.
+    user = get_principal(email) if request.method in SAFE_METHODS else None
 
-    if not user:
-        raise HTTPException(
-            status_code = status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
-        )
+    if user is None:
+        #  Load user from db (source of truth)
+        user = db.query(AdminUser).filter(AdminUser.email == email).first()
+
+        if not user:
+            raise HTTPException(
+                status_code = status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user",
+            )
+
+        # only active users are cached, deactivation drops the entry
+        set_principal(user)
     
     # optional: role verification 
     if user.role != role:
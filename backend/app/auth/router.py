@@ -1,28 +1,46 @@
 from fastapi import APIRouter, HTTPException, Depends # Tools to build the API
+from fastapi.concurrency import run_in_threadpool
 from app.auth.schemas import LoginRequest, TokenResponse
-from app.utils.jwt import create_access_token
+from app.utils.jwt import create_access_token, token_cache_stats
 
-from app.utils.security import verify_password # password verification function
+from app.utils.security import ( # password verification (runs in its own pool)
+    PasswordPoolBusy,
+    password_pool_stats,
+    verify_password_async,
+)
 from app.db.session import get_db # database session
 from sqlalchemy.orm import session
 from app.models.login_model import AdminUser
 from app.auth.deps import get_current_user
+from app.auth.cache import principal_cache_stats
 
 # Setup the router for Login and User info
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 # 1. Login to get a token
 @router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: session = Depends(get_db)):
+async def login(data: LoginRequest, db: session = Depends(get_db)):
     # Step 1: Look for the user in the database by their email
-    user = db.query(AdminUser).filter(AdminUser.email==data.email).first()
+    # (sync DB call, so keep it off the event loop)
+    user = await run_in_threadpool(
+        lambda: db.query(AdminUser).filter(AdminUser.email==data.email).first()
+    )
 
     # Step 2: If the user doesn't exist, stop and show an error
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Step 3: Check if the password is correct
-    if not verify_password(data.password, user.hashed_password):
+    # bcrypt runs on the dedicated password pool, not the shared threadpool
+    try:
+        password_ok = await verify_password_async(data.password, user.hashed_password)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many login attempts in progress, please retry",
+        )
+
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # Step 4: If everything is correct, create a secure login token
@@ -43,3 +61,16 @@ def get_me(current_user: AdminUser = Depends(get_current_user)):
         "role": current_user.role,
         "is_active": current_user.is_active,
     }
+
+# 3. Get hit/miss counters of the auth caches
+@router.get("/cache-stats")
+def get_cache_stats(current_user: AdminUser = Depends(get_current_user)):
+    return {
+        "principals": principal_cache_stats(),
+        "tokens": token_cache_stats(),
+    }
+
+# 4. Get queue depth and usage of the password hashing pool
+@router.get("/password-pool-stats")
+def get_password_pool_stats(current_user: AdminUser = Depends(get_current_user)):
+    return password_pool_stats()
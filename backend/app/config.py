@@ -10,11 +10,87 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+
+# SQLAlchemy connection pool settings (read from DB_* env vars)
+class DatabasePoolSettings(BaseSettings):
+    pool_size: int = 5
+    # connections kept open per worker process
+
+    max_overflow: int = 10
+    # extra connections allowed during bursts
+
+    async_pool_size: int = 5
+    async_max_overflow: int = 10
+    # the same for the async (asyncpg) engine of the public read endpoints.
+    # Each worker holds both pools, so it can open up to
+    # pool_size + max_overflow + async_pool_size + async_max_overflow
+    # connections: keep workers x that below the database's limit
+
+    pool_timeout: float = 30
+    # seconds to wait for a free connection before failing
+
+    pool_recycle: int = 1800
+    # seconds before a connection is replaced (poolers drop idle ones)
+
+    pool_pre_ping: bool = True
+    # test connections before use so stale ones are replaced silently
+
+    statement_timeout_ms: int = 15000
+    # server-side limit per SQL statement (0 = no limit)
+
+    pgbouncer_mode: bool = False
+    # True when DATABASE_URL points to pgbouncer / Supabase pooler in
+    # transaction mode: the pooler owns the pooling, so we use NullPool and
+    # skip startup options it does not support
+
+    model_config = {"env_prefix": "DB_", "extra": "ignore"}
+
+
+DB_POOL = DatabasePoolSettings()
+
 # JWT
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 TOKEN_EXPIRE_MINUTES = int(os.getenv("TOKEN_EXPIRE_MINUTES", 120))
 
+# Auth principal cache (skips the AdminUser lookup on repeated reads)
+# Deactivations made outside this process take up to the TTL to apply to reads
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30))
+PRINCIPAL_CACHE_MAXSIZE = int(os.getenv("PRINCIPAL_CACHE_MAXSIZE", 1024))
+
+# Verified JWT cache (skips signature checks for tokens we already verified)
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", 4096))
+
+# Public response cache (invalidated by writes, TTL is a safety net)
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 300))
+RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", 512))
+
+# Password hashing pool (bcrypt runs here, not in the shared request threadpool)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+
+# Per-request SQL stats (query count, DB time, slowest statement)
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "false").lower() == "true"
+# requests above either limit are logged as warnings, the rest at debug level
+QUERY_STATS_WARN_QUERIES = int(os.getenv("QUERY_STATS_WARN_QUERIES", 20))
+QUERY_STATS_WARN_DB_MS = float(os.getenv("QUERY_STATS_WARN_DB_MS", 500))
+
+# OpenTelemetry tracing (off by default; the collector address comes from
+# the standard OTEL_EXPORTER_OTLP_ENDPOINT variable)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "leafclutch-backend")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", 1.0))  # 0.1 = 10% of requests
+TRACING_SQL_STATEMENTS = os.getenv("TRACING_SQL_STATEMENTS", "true").lower() == "true"
+
+# Prometheus scrape endpoint: GET /metrics needs "Authorization: Bearer <token>".
+# Without a token the endpoint is switched off (404), it exposes route names,
+# traffic and pool sizes.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Bulk import endpoints (max items per request)
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 1000))
+
 # Cloudinary
 # CLOUDINARY_URL = os.getenv("CLOUDINARY_URL")
 
@@ -23,6 +99,17 @@ APPWRITE_ENDPOINT = os.getenv("APPWRITE_ENDPOINT")
 APPWRITE_PROJECT_ID = os.getenv("APPWRITE_PROJECT_ID")
 APPWRITE_API_KEY = os.getenv("APPWRITE_API_KEY")
 APPWRITE_BUCKET_ID = os.getenv("APPWRITE_BUCKET_ID")
+APPWRITE_TIMEOUT_SECONDS = float(os.getenv("APPWRITE_TIMEOUT_SECONDS", 30))
+APPWRITE_MAX_CONNECTIONS = int(os.getenv("APPWRITE_MAX_CONNECTIONS", 10))
+
+# Image derivatives (resized WebP/AVIF copies of every upload)
+IMAGE_VARIANT_WIDTHS = [
+    int(width) for width in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")
+]
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 0))  # 0 = one per CPU core
+# a 1MB file can still decode to gigabytes (decompression bomb), so the
+# pixel count is limited too (25M = 5000x5000, ~100MB decoded as RGBA)
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 25_000_000))
 
 # Safety checks (fail fast)
 if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
@@ -0,0 +1,58 @@
+# Flags foreign keys without an index.
+#
+# Postgres indexes primary keys but never foreign key columns. Without one,
+# every "children of X" lookup and every delete of a parent (which has to
+# look for referencing rows) scans the whole child table.
+#
+#     cd backend
+#     python -m app.db.index_check     # exit code 1 if a foreign key is not indexed
+#
+# `alembic revision --autogenerate` runs the same check and prints a warning.
+
+import sys
+from sqlalchemy import MetaData
+
+
+def unindexed_foreign_keys(metadata: MetaData) -> list[str]:
+    """
+    "table(column, ...) -> referenced_table" for every foreign key whose
+    columns are not the leading columns of the primary key, a unique
+    constraint or a (non-partial) index of its table.
+    """
+    problems = []
+    for table in metadata.sorted_tables:
+        # Step 1: Column lists Postgres can use for "WHERE fk_column = ?"
+        covering = [[column.name for column in table.primary_key.columns]]
+        for index in table.indexes:
+            if index.dialect_options["postgresql"]["where"] is None:
+                covering.append([column.name for column in index.columns])
+        for constraint in table.constraints:
+            if constraint.__visit_name__ == "unique_constraint":
+                covering.append([column.name for column in constraint.columns])
+
+        # Step 2: Every foreign key needs one of them to start with its columns
+        for foreign_key in table.foreign_key_constraints:
+            columns = set(foreign_key.column_keys)
+            if not any(set(names[:len(columns)]) == columns for names in covering):
+                problems.append(
+                    f"{table.name}({', '.join(foreign_key.column_keys)}) -> {foreign_key.referred_table.name}"
+                )
+    return problems
+
+
+def main() -> int:
+    from app.db.base import Base
+    import app.models  # noqa: F401  (registers every model with Base.metadata)
+
+    problems = unindexed_foreign_keys(Base.metadata)
+    for problem in problems:
+        print(f"Unindexed foreign key: {problem}")
+    if problems:
+        print("Add index=True to the column (or an Index in __table_args__) and a migration for it.")
+        return 1
+    print("Every foreign key is indexed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,246 @@
 # SQLAlchemy database session
 # Used for models, migrations, and authentication queries
 
-from sqlalchemy import create_engine
+import time
+from uuid import uuid4
+from contextvars import ContextVar
+from threading import Lock
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.config import DATABASE_URL, DB_POOL
 
-engine = create_engine(DATABASE_URL)
+
+# ---------- pool instrumentation ----------
+# Each worker has two pools: "sync" (psycopg2, most endpoints) and "async"
+# (asyncpg, the public read endpoints). Both are counted separately.
+ENGINES = ("sync", "async")
+
+_lock = Lock()
+_stats = {
+    name: {
+        "checkouts": 0,
+        "connects": 0,
+        "invalidations": 0,
+        "timeouts": 0,
+        "wait_time_total_ms": 0.0,
+        "wait_time_max_ms": 0.0,
+    }
+    for name in ENGINES
+}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long requests wait for a connection
+    (including opening a new one) and how often the wait timed out.
+    """
+
+    engine_name = "sync"
+
+    def _do_get(self):
+        stats = _stats[self.engine_name]
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with _lock:
+                stats["timeouts"] += 1
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - start) * 1000
+            with _lock:
+                stats["wait_time_total_ms"] += waited_ms
+                stats["wait_time_max_ms"] = max(stats["wait_time_max_ms"], waited_ms)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The same numbers for the asyncpg engine."""
+
+    engine_name = "async"
+
+
+def _engine_options() -> dict:
+    if DB_POOL.pgbouncer_mode:
+        # the external pooler does the pooling; options= is not supported there
+        return {"poolclass": NullPool, "pool_pre_ping": DB_POOL.pool_pre_ping}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL.pool_size,
+        "max_overflow": DB_POOL.max_overflow,
+        "pool_timeout": DB_POOL.pool_timeout,
+        "pool_recycle": DB_POOL.pool_recycle,
+        "pool_pre_ping": DB_POOL.pool_pre_ping,
+    }
+    if DB_POOL.statement_timeout_ms and DATABASE_URL.startswith("postgres"):
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={DB_POOL.statement_timeout_ms}"
+        }
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options())
 session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
 def get_db():
     db = session_local()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ---------- async engine (asyncpg) ----------
+# Used by the read-heavy public endpoints so a request waiting on Postgres
+# does not hold one of the AnyIO threadpool slots.
+def _async_engine_args() -> tuple:
+    url = make_url(DATABASE_URL)
+    connect_args = {}
+
+    # asyncpg takes "ssl" instead of libpq's "sslmode" query parameter
+    sslmode = url.query.get("sslmode")
+    if sslmode:
+        url = url.difference_update_query(["sslmode"])
+        connect_args["ssl"] = sslmode
+
+    url = url.set(drivername="postgresql+asyncpg")
+
+    if DB_POOL.pgbouncer_mode:
+        # transaction-mode poolers break prepared statements: turn off both
+        # caches (asyncpg's and SQLAlchemy's) and give every statement a
+        # unique name, so two clients sharing a server connection never clash
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        return url, {"poolclass": NullPool, "connect_args": connect_args}
+
+    if DB_POOL.statement_timeout_ms:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(DB_POOL.statement_timeout_ms)
+        }
+    return url, {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": DB_POOL.async_pool_size,
+        "max_overflow": DB_POOL.async_max_overflow,
+        "pool_timeout": DB_POOL.pool_timeout,
+        "pool_recycle": DB_POOL.pool_recycle,
+        "pool_pre_ping": DB_POOL.pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+_async_url, _async_options = _async_engine_args()
+async_engine = create_async_engine(_async_url, **_async_options)
+async_session_local = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    async with async_session_local() as db:
+        yield db
+
+
+# ---------- pool stats (both engines) ----------
+def _count_pool_events(target, name: str) -> None:
+    stats = _stats[name]
+
+    def on_connect(dbapi_connection, connection_record):
+        with _lock:
+            stats["connects"] += 1
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _lock:
+            stats["checkouts"] += 1
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with _lock:
+            stats["invalidations"] += 1
+
+    event.listen(target, "connect", on_connect)
+    event.listen(target, "checkout", on_checkout)
+    event.listen(target, "invalidate", on_invalidate)
+
+
+_count_pool_events(engine, "sync")
+_count_pool_events(async_engine.sync_engine, "async")
+
+
+def _engine_pool_stats(pool, name: str, max_overflow: int) -> dict:
+    # live numbers come from the pool itself, counters from the events above
+    live = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        live.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=max_overflow,
+            timeout_seconds=DB_POOL.pool_timeout,
+        )
+    with _lock:
+        counters = dict(_stats[name])
+    checkouts = counters["checkouts"]
+    counters["wait_time_avg_ms"] = (
+        counters["wait_time_total_ms"] / checkouts if checkouts else 0.0
+    )
+    return {**live, **counters}
+
+
+def pool_stats() -> dict:
+    # one entry per engine, each worker can hold connections in both
+    return {
+        "sync": _engine_pool_stats(engine.pool, "sync", DB_POOL.max_overflow),
+        "async": _engine_pool_stats(async_engine.pool, "async", DB_POOL.async_max_overflow),
+    }
+
+
+# ---------- per-request query stats ----------
+# QueryStatsMiddleware (app/utils/query_stats.py) puts a QueryStats object here
+# for every request. The events below add each SQL statement run by the sync
+# and async engines to it. Outside of a request (scripts, migrations) it is
+# None and the events do nothing. Sync endpoints still see it: the threadpool
+# copies the request's context into the worker thread.
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql: str | None = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = " ".join(statement.split())[:300]  # SQL only, never parameters
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI # The main tool to build the API
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,14 +14,42 @@ from app.routes import projects
 from app.routes import project_feedback
 from app.routes import opportunities
 from app.routes.admin import appwrite_uploads
+from app.routes import metrics
+from app.utils.storage import start_storage, stop_storage
+from app.utils.images import shutdown_image_pool
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils.metrics import MetricsMiddleware, mark_worker_stopped
+from app.utils.tracing import setup_tracing, shutdown_tracing
+from app.db.session import async_engine
 
 
 load_dotenv()
 
+# Open shared clients once per worker and close them on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_storage()
+    yield
+    await stop_storage()
+    shutdown_image_pool()
+    await async_engine.dispose()
+    shutdown_tracing()
+    mark_worker_stopped()
+
+
 # Create the main app
-app = FastAPI(title="Leafclutch backend")
+app = FastAPI(title="Leafclutch backend", lifespan=lifespan)
+
+# Opt-in OpenTelemetry tracing (TRACING_ENABLED=true)
+setup_tracing(app)
 
 
+# Count SQL queries and DB time per request (logs, optional headers)
+app.add_middleware(QueryStatsMiddleware)
+
+# Prometheus request metrics (served at /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Allow the frontend to talk to the backend (CORS)
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +59,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # let browser clients read the pagination and caching headers
+    expose_headers=[
+        "ETag",
+        "Last-Modified",
+        "Link",
+        "X-Next-Cursor",
+        "X-Total-Count",
+        "X-DB-Query-Count",
+        "X-DB-Time-Ms",
+        "Server-Timing",
+    ],
 )
 
 # Connect all the different route files to the main app
@@ -45,6 +85,7 @@ app.include_router(project_feedback.router)
 app.include_router(opportunities.router) 
 app.include_router(appwrite_uploads.router) 
 app.include_router(health_router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
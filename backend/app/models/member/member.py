@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Date, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Date, Boolean, DateTime, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from .enums import MemberRole
@@ -13,6 +13,18 @@ class Member(Base):
     """
 
     __tablename__ = "members"
+    __table_args__ = (
+        # keyset pagination (ORDER BY created_at DESC, id DESC)
+        Index("ix_members_created_at_id", "created_at", "id"),
+        # team/intern lists: visible members of one role, newest first
+        Index(
+            "ix_members_visible_role_created_at_id",
+            "role",
+            "created_at",
+            "id",
+            postgresql_where=text("is_visible"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # UUID for safety and scalability
@@ -3,3 +3,8 @@ import enum
 class OpportunityType(str, enum.Enum):
     JOB = "JOB"
     INTERNSHIP = "INTERNSHIP"
+
+
+class SearchMode(str, enum.Enum):
+    CONTAINS = "contains"  # substring match on the title (trigram index)
+    RANKED = "ranked"      # full-text match on title/description/requirements, best first
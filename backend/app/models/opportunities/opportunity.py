@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Enum, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from app.db.base import Base
 from .enums import OpportunityType
 
@@ -13,6 +14,25 @@ class Opportunity(Base):
     """
 
     __tablename__ = "opportunities"
+    __table_args__ = (
+        # keyset pagination (ORDER BY created_at DESC, id DESC)
+        Index("ix_opportunities_created_at_id", "created_at", "id"),
+        # full-text search (search_mode=ranked)
+        Index("ix_opportunities_search_vector", "search_vector", postgresql_using="gin"),
+        # substring search with ILIKE '%...%' (search_mode=contains, location filter)
+        Index(
+            "ix_opportunities_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_opportunities_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # Unique identifier
@@ -29,6 +49,10 @@ class Opportunity(Base):
     type = Column(Enum(OpportunityType), nullable=False)
     # JOB or INTERNSHIP
 
+    search_vector = deferred(Column(TSVECTOR))
+    # Title + description + requirements, kept up to date by DB triggers
+    # (see migration b71d2c5e9f03), never written by the app
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
@@ -16,7 +16,8 @@ class OpportunityRequirement(Base):
     opportunity_id = Column(
         UUID(as_uuid=True),
         ForeignKey("opportunities.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True,
     )
     # Automatically removed when opportunity is deleted
 
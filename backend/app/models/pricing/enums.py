@@ -4,3 +4,10 @@ class DiscountType(enum.Enum):
     # Enum is used instead of string to avoid invalid values like "percent" or "PERC"
     PERCENTAGE = "PERCENTAGE"
     AMOUNT = "AMOUNT"
+
+
+class CatalogSort(str, enum.Enum):
+    # Order of the service/training lists
+    NEWEST = "newest"          # created_at, newest first (default)
+    PRICE = "price"            # effective_price, cheapest first
+    PRICE_DESC = "price_desc"  # effective_price, most expensive first
@@ -0,0 +1,45 @@
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import Column, Computed, Numeric
+from .enums import DiscountType
+
+# ---------- pricing rule (single source of truth) ----------
+# effective_price = base_price - discount, rounded to cents, never below 0
+#   PERCENTAGE: base_price * (1 - discount_value / 100)
+#   AMOUNT:     base_price - discount_value
+# No discount_type or no discount_value means no discount.
+#
+# Postgres computes the stored column with EFFECTIVE_PRICE_SQL, so lists can
+# filter and sort by price with an index. effective_price() is the same rule
+# in Python, for prices that are not stored yet (e.g. previews).
+
+EFFECTIVE_PRICE_SQL = (
+    "GREATEST(0, ROUND(CASE"
+    " WHEN discount_type IS NULL OR discount_value IS NULL THEN base_price"
+    " WHEN discount_type = 'PERCENTAGE' THEN base_price * (1 - discount_value / 100)"
+    " ELSE base_price - discount_value"
+    " END, 2))"
+)
+
+
+def effective_price(
+    base_price: Decimal,
+    discount_type: DiscountType | None,
+    discount_value: Decimal | None,
+) -> Decimal:
+    base_price = Decimal(base_price)
+    if discount_type is None or discount_value is None:
+        price = base_price
+    elif discount_type == DiscountType.PERCENTAGE:
+        price = base_price * (1 - Decimal(discount_value) / 100)
+    else:
+        price = base_price - Decimal(discount_value)
+    return max(Decimal("0"), price).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def effective_price_column() -> Column:
+    # Generated column: Postgres keeps it in sync on every INSERT/UPDATE
+    return Column(
+        Numeric(10, 2),
+        Computed(EFFECTIVE_PRICE_SQL, persisted=True),
+        nullable=False,
+    )
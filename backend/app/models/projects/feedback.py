@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
 
 class ProjectFeedback(Base):
@@ -11,6 +12,10 @@ class ProjectFeedback(Base):
     """
 
     __tablename__ = "project_feedbacks"
+    __table_args__ = (
+        # keyset pagination of a project's feedbacks (newest first)
+        Index("ix_project_feedbacks_project_id_created_at_id", "project_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -34,3 +39,11 @@ class ProjectFeedback(Base):
     # Rating between 1 and 5 (validated in logic)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # ---------- ORM RELATIONSHIP ----------
+    # allows: feedback.project
+    # required for project.feedbacks to work
+    project = relationship(
+        "Project",
+        back_populates="feedbacks",
+    )
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
 
 class Project(Base):
@@ -10,6 +11,10 @@ class Project(Base):
     """
 
     __tablename__ = "projects"
+    __table_args__ = (
+        # keyset pagination (ORDER BY created_at DESC, id DESC)
+        Index("ix_projects_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # Unique project ID
@@ -33,3 +38,19 @@ class Project(Base):
         onupdate=datetime.utcnow,
         nullable=False
     )
+
+    # ---------------- ORM RELATIONSHIPS ----------------
+    # allows: project.feedbacks
+    feedbacks = relationship(
+        "ProjectFeedback",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # allows: project.techs (read-only, links are written via ProjectTechMap)
+    techs = relationship(
+        "ServiceTech",
+        secondary="project_tech_map",
+        viewonly=True,
+    )
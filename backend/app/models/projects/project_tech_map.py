@@ -21,4 +21,5 @@ class ProjectTechMap(Base):
         UUID(as_uuid=True),
         ForeignKey("service_techs.id"),
         primary_key=True,
+        index=True,
     )
@@ -1,10 +1,10 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, DateTime, Enum
+from sqlalchemy import Column, String, Numeric, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from app.models.pricing.enums import DiscountType
-from decimal import Decimal
+from app.models.pricing.price import effective_price_column
 
 class Service(Base):
     """
@@ -13,6 +13,12 @@ class Service(Base):
     """
 
     __tablename__ = "services"
+    __table_args__ = (
+        # keyset pagination (ORDER BY created_at DESC, id DESC)
+        Index("ix_services_created_at_id", "created_at", "id"),
+        # price filters and ?sort=price / price_desc
+        Index("ix_services_effective_price_id", "effective_price", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # UUID used for security and scalability
@@ -35,6 +41,9 @@ class Service(Base):
     discount_value = Column(Numeric(10, 2), nullable=True)
     # Discount amount or percentage
 
+    effective_price = effective_price_column()
+    # Price after discount, computed by Postgres (see app/models/pricing/price.py)
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
@@ -42,18 +51,3 @@ class Service(Base):
         onupdate=datetime.utcnow,
         nullable=False
     )
-
-    @property
-    def effective_price(self):
-        """
-        Calculated dynamically to avoid inconsistent data.
-        """
-        if not self.discount_type or not self.discount_value:
-            return self.base_price
-
-        if self.discount_type == DiscountType.PERCENTAGE:
-            return self.base_price * (
-            Decimal("1") - self.discount_value / Decimal("100")
-        )
-
-        return max(Decimal("0"), self.base_price - self.discount_value)
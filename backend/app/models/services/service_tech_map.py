@@ -8,4 +8,4 @@ class ServiceTechMap(Base):
     __tablename__ = "service_tech_map"
 
     service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), primary_key=True)
-    tech_id = Column(UUID(as_uuid=True), ForeignKey("service_techs.id"), primary_key=True)
+    tech_id = Column(UUID(as_uuid=True), ForeignKey("service_techs.id"), primary_key=True, index=True)
@@ -21,7 +21,8 @@ class TrainingBenefit(Base):
     training_id = Column(
         UUID(as_uuid=True),
         ForeignKey("trainings.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True,
     )
 
     # Actual benefit text shown in UI
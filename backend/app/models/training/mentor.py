@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -11,6 +11,10 @@ class Mentor(Base):
     """
 
     __tablename__ = "mentors"
+    __table_args__ = (
+        # listing and keyset pagination (ORDER BY name, id)
+        Index("ix_mentors_name_id", "name", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
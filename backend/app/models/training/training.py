@@ -1,10 +1,11 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, DateTime, Enum
+from sqlalchemy import Column, String, Numeric, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
 from app.models.pricing.enums import DiscountType
+from app.models.pricing.price import effective_price_column
 
 class Training(Base):
     """
@@ -14,6 +15,12 @@ class Training(Base):
     """
 
     __tablename__ = "trainings"
+    __table_args__ = (
+        # keyset pagination (ORDER BY created_at DESC, id DESC)
+        Index("ix_trainings_created_at_id", "created_at", "id"),
+        # price filters and ?sort=price / price_desc
+        Index("ix_trainings_effective_price_id", "effective_price", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # UUID is used instead of integer for better security and scalability
@@ -36,6 +43,9 @@ class Training(Base):
     discount_value = Column(Numeric(10, 2), nullable=True)
     # Discount value depends on discount_type
 
+    effective_price = effective_price_column()
+    # Price after discount, computed by Postgres (see app/models/pricing/price.py)
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     # Stored for audit and sorting
 
@@ -59,19 +69,5 @@ class Training(Base):
         "TrainingMentor",
         back_populates="training",
         cascade="all, delete-orphan",
+        order_by="TrainingMentor.order",  # order the mentors were sent in
     )
-
-    @property
-    def effective_price(self):
-        """
-        This follows the pricing rule from the docs:
-        effective_price = base_price − discount
-        """
-        if not self.discount_type or not self.discount_value:
-            return self.base_price
-
-        if self.discount_type == DiscountType.PERCENTAGE:
-            return self.base_price * (1 - self.discount_value / 100)
-
-        return self.base_price - self.discount_value
-
@@ -21,7 +21,8 @@ class TrainingMentor(Base):
     mentor_id = Column(
         UUID(as_uuid=True),
         ForeignKey("mentors.id", ondelete="CASCADE"),
-        primary_key=True
+        primary_key=True,
+        index=True,  # the primary key only covers lookups by training_id
     )
 
     order = Column(Integer)
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import asyncio
+import logging
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.datastructures import UploadFile
 from app.auth.deps import get_current_user
-from appwrite.client import Client
-from appwrite.services.storage import Storage
-from appwrite.id import ID
-from appwrite.input_file import InputFile
-from app.config import (
-    APPWRITE_API_KEY,
-    APPWRITE_BUCKET_ID,
-    APPWRITE_ENDPOINT,
-    APPWRITE_PROJECT_ID
+from app.config import IMAGE_VARIANT_WIDTHS
+from app.utils.images import (
+    available_formats,
+    get_image_pool,
+    image_pixels_ok,
+    render_variants,
+    variant_names,
 )
+from app.utils.storage import AppwriteStorage, get_storage
+from app.utils.metrics import record_upload
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/admin/uploads",
@@ -17,59 +24,200 @@ router = APIRouter(
 )
 
 
+MAX_IMAGE_SIZE = 1_000_000  # 1 MB
+MULTIPART_OVERHEAD = 16_384  # room for boundaries and part headers
+MAX_FORM_FIELDS = 10  # extra text fields (e.g. a caption) are ignored, not rejected
 
+# File signatures ("magic bytes") of the image formats we accept
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
 
-def get_storage() -> Storage:
-    client = Client()
-    client.set_endpoint(APPWRITE_ENDPOINT)
-    client.set_project(APPWRITE_PROJECT_ID)
-    client.set_key(APPWRITE_API_KEY)
-    return Storage(client)
 
-MAX_IMAGE_SIZE = 1_000_000  # 1 MB
+def sniff_image_type(head: bytes) -> str | None:
+    # Detect the real image type from the first bytes, not the client's header
+    for signature, mime_type in IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    return None
+
+
+def image_too_large() -> HTTPException:
+    # 413 Payload Too Large (this used to be a 400 before uploads were
+    # streamed; the dashboard only reads "detail", which did not change)
+    return HTTPException(
+        status_code=413,
+        detail="Image too large (max 1MB allowed)",
+    )
+
+
+async def limited_body(request: Request, limit: int):
+    # Yield the request body chunk by chunk and stop as soon as it is too big,
+    # so an oversized upload is rejected after ~limit bytes instead of at the end
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise image_too_large()
+        yield chunk
+
+
+async def read_image_upload(request: Request) -> UploadFile:
+    """
+    Parse the multipart body while streaming, with early size rejection.
+    Returns the single "file" part.
+    """
+    # Step 1: Reject straight away if the client tells us the body is too big
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > MAX_IMAGE_SIZE + MULTIPART_OVERHEAD:
+            raise image_too_large()
+
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Expected multipart/form-data")
+
+    # Step 2: Parse the body from the size-limited stream
+    # (parts up to 1MB stay in memory, so nothing ever exceeds the limit)
+    parser = MultiPartParser(
+        request.headers,
+        limited_body(request, MAX_IMAGE_SIZE + MULTIPART_OVERHEAD),
+        max_files=1,
+        max_fields=MAX_FORM_FIELDS,
+    )
+    try:
+        form = await parser.parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    file = form.get("file")
+    if not isinstance(file, UploadFile):
+        raise HTTPException(status_code=400, detail="Missing image file")
+
+    # Step 3: Exact check on the file part itself
+    if file.size is not None and file.size > MAX_IMAGE_SIZE:
+        raise image_too_large()
+
+    return file
+
+
+async def store_image_variants(
+    storage: AppwriteStorage,
+    base_id: str,
+    data: bytes,
+    formats: list[str],
+) -> None:
+    """
+    Background task: encode the variants in the process pool, then upload
+    each one under the file ID that was already returned to the client.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        variants = await loop.run_in_executor(
+            get_image_pool(),
+            render_variants,
+            data,
+            IMAGE_VARIANT_WIDTHS,
+            formats,
+        )
+        for name, variant_bytes, mime_type in variants:
+            await storage.create_file(
+                variant_bytes,
+                filename=f"{base_id}_{name}.{mime_type.split('/')[1]}",
+                mime_type=mime_type,
+                file_id=f"{base_id}_{name}",
+            )
+            record_upload("variant", len(variant_bytes))
+    except Exception:
+        # the original image is already stored, so only log the failure
+        logger.exception("Failed to create image variants for %s", base_id)
+
+
+# OpenAPI description of the body, since the route parses it manually
+IMAGE_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
 
-@router.post("/image")
+@router.post("/image", openapi_extra=IMAGE_UPLOAD_OPENAPI)
 async def upload_image(
-    file: UploadFile = File(...),
+    request: Request,
+    background_tasks: BackgroundTasks,
+    storage: AppwriteStorage = Depends(get_storage), # shared client from startup
     admin = Depends(get_current_user)
 ):
-    if not file.content_type.startswith("image/"):
+    # Step 1: Stream the upload in, rejecting oversized bodies early
+    file = await read_image_upload(request)
+
+    if not (file.content_type or "").startswith("image/"):
         raise HTTPException(status_code=400, detail="Invalid image type")
-    
-    storage = get_storage()
+
+    # Step 2: Check the magic bytes from the first chunk
+    head = await file.read(16)
+    mime_type = sniff_image_type(head)
+    if mime_type is None:
+        raise HTTPException(status_code=400, detail="Invalid image type")
+    await file.seek(0)
+
+    # We pick the file ID ourselves so variant IDs (and URLs) are known upfront
+    base_id = uuid.uuid4().hex[:20]
 
     try:
-        # read file bytes
+        # read file bytes (at most MAX_IMAGE_SIZE, already checked above)
         file_bytes = await file.read()
 
-        # Validate file size
-        if len(file_bytes) > MAX_IMAGE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail="Image too large (max 1MB allowed)"
-            )
-        #  wrap for appwrite
-        input_file = InputFile.from_bytes(
+        # a small file can still be a huge image once decoded
+        if not image_pixels_ok(file_bytes):
+            raise HTTPException(status_code=400, detail="Image dimensions too large")
+
+        # upload (awaited on the pooled client, does not block the event loop)
+        result = await storage.create_file(
             file_bytes,
             filename=file.filename,
-            mime_type = file.content_type,
-        )
-        # upload
-        result = storage.create_file(
-            bucket_id=APPWRITE_BUCKET_ID,
-            file_id=ID.unique(),
-            file=input_file,
+            mime_type=mime_type,
+            file_id=base_id,
         )
+        record_upload("original", len(file_bytes))
     except HTTPException:
         raise
     except Exception as e:
-        print("APPWRITE ERROR:", e)
+        logger.exception("Failed to upload image %s to Appwrite", base_id)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await file.close()
     
-    return {
-        "image_url": (
-        f"{APPWRITE_ENDPOINT}/storage/buckets/"
-        f"{APPWRITE_BUCKET_ID}/files/{result['$id']}/view"
-        f"?project={APPWRITE_PROJECT_ID}"
+    # Step 3: Resize/re-encode after the response is sent (off the request path)
+    formats = available_formats()
+    background_tasks.add_task(
+        store_image_variants,
+        storage,
+        base_id,
+        file_bytes,
+        formats,
     )
-    }
+
+    # Variant URLs become available once the background task has finished
+    return {
+        "image_url": storage.file_view_url(result["$id"]),
+        "variants": {
+            name: storage.file_view_url(f"{base_id}_{name}")
+            for name in variant_names(IMAGE_VARIANT_WIDTHS, formats)
+        },
+    }
\ No newline at end of file
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException # Tools to build the API
 from app.db.supabase import supabase # Connection to Supabase
+from app.db.session import pool_stats # SQLAlchemy connection pool numbers
+from app.utils.response_cache import response_cache_stats
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for health checks
@@ -30,3 +32,15 @@ def check_database_connection(user = Depends(get_current_user)):
                 "error": str(e)
             }
         )
+
+
+# 2. Show live SQLAlchemy connection pool usage (checkouts, overflow, wait time)
+@router.get("/db/pool")
+def check_database_pool(user = Depends(get_current_user)):
+    return pool_stats()
+
+
+# 3. Show hit ratio of the public response cache
+@router.get("/cache")
+def check_response_cache(user = Depends(get_current_user)):
+    return response_cache_stats()
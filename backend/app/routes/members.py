@@ -1,9 +1,12 @@
 import datetime # To handle dates and times
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from app.db.session import get_db
+from app.config import BULK_MAX_ITEMS
+from app.db.session import get_db, get_async_db
 from app.models.member.member import Member
 from app.schemas.members import (
     MemberCreate,
@@ -11,12 +14,48 @@ from app.schemas.members import (
     MemberResponse,
     MemberRole,
 )
+from app.utils.response_cache import cached_response, invalidate_responses
+from app.schemas.bulk import BulkResult
+from app.utils.bulk import bulk_result, ok, validate_items
+from app.utils.pagination import PageParams, keyset, page_headers, split_page
+from app.utils.conditional import (
+    collection_validators,
+    is_not_modified,
+    item_validators,
+    json_response,
+    not_modified,
+)
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for all member-related links
 router = APIRouter(prefix="/admin/members", tags=["Members"])
 
 
+# ---------- shared list response (used by ALL, TEAMS, INTERNS) ----------
+# Answers 304 when the filtered members did not change, otherwise loads them
+# (one page when ?limit= is given, newest first)
+async def member_list_response(
+    request: Request,
+    db: AsyncSession,
+    page: PageParams,
+    *filters,
+):
+    validators = await collection_validators(request, db, Member, *filters)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+
+    members, next_cursor = split_page(
+        (await db.scalars(keyset(select(Member).where(*filters), Member, page))).all(),
+        page,
+    )
+    return json_response(
+        list[MemberResponse],
+        members,
+        validators,
+        page_headers(request, page, next_cursor, validators.count),
+    )
+
+
 # 1. Create a new member (Team or Intern)
 @router.post(
     "",
@@ -49,49 +88,56 @@ def create_member(
     # Save the new member to the database
     db.add(member)
     db.commit()
+    invalidate_responses("members")
     db.refresh(member)
 
     return member
 
 # 2. Get a list of ALL members
 @router.get("", response_model=list[MemberResponse])
-def list_members(
-    db: Session = Depends(get_db),
+async def list_members(
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Get every member from the database
-    return db.query(Member).all()
+    return await member_list_response(request, db, page)
 
 # 3. Get only the Team members
 @router.get("/teams", response_model=list[MemberResponse])
-def list_team_members(
-    db: Session = Depends(get_db),
+@cached_response("members")
+async def list_team_members(
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Get only members who are marked as "TEAM" and are visible
-    return (
-        db.query(Member)
-        .filter(
-            Member.role == MemberRole.TEAM,
-            Member.is_visible == True,
-        )
-        .all()
+    return await member_list_response(
+        request,
+        db,
+        page,
+        Member.role == MemberRole.TEAM,
+        Member.is_visible == True,
     )
 
 # 4. Get only the Interns
 @router.get("/interns", response_model=list[MemberResponse])
-def list_intern_members(
-    db: Session = Depends(get_db),
+@cached_response("members")
+async def list_intern_members(
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Get only members who are marked as "INTERN" and are visible
-    return (
-        db.query(Member)
-        .filter(
-            Member.role == MemberRole.INTERN,
-            Member.is_visible == True,
-        )
-        .all()
+    return await member_list_response(
+        request,
+        db,
+        page,
+        Member.role == MemberRole.INTERN,
+        Member.is_visible == True,
     )
 
 # 5. Update a member's information
@@ -126,6 +172,7 @@ def update_member(
 
     # Step 4: Save changes to the database
     db.commit()
+    invalidate_responses("members")
     db.refresh(member)
 
     return member
@@ -133,21 +180,23 @@ def update_member(
 
 # 6. Get details of a specific Team member
 @router.get("/team/{member_id}", response_model=MemberResponse)
-def get_team_member(
+async def get_team_member(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
    
 ):
     # Step 1: Find the specific team member by their ID
     member = (
-        db.query(Member)
-        .filter(
-            Member.id == member_id,
-            Member.role == MemberRole.TEAM,
-            Member.is_visible == True,
+        await db.scalars(
+            select(Member).where(
+                Member.id == member_id,
+                Member.role == MemberRole.TEAM,
+                Member.is_visible == True,
+            )
         )
-        .first()
-    )
+    ).first()
 
     if not member:
         raise HTTPException(
@@ -155,25 +204,33 @@ def get_team_member(
             detail="Team member not found",
         )
 
+    # Answer 304 if the client already has this version
+    validators = item_validators(request, member)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
+
     return member
 
 # 7. Get details of a specific Intern
 @router.get("/intern/{member_id}", response_model=MemberResponse)
-def get_intern_member(
+async def get_intern_member(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Find the specific intern by their ID
     member = (
-        db.query(Member)
-        .filter(
-            Member.id == member_id,
-            Member.role == MemberRole.INTERN,
-            Member.is_visible == True,
+        await db.scalars(
+            select(Member).where(
+                Member.id == member_id,
+                Member.role == MemberRole.INTERN,
+                Member.is_visible == True,
+            )
         )
-        .first()
-    )
+    ).first()
 
     if not member:
         raise HTTPException(
@@ -181,22 +238,26 @@ def get_intern_member(
             detail="Intern not found",
         )
 
+    # Answer 304 if the client already has this version
+    validators = item_validators(request, member)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
+
     return member
 
 
 # 8. Get any member by their ID (Admin only)
 @router.get("/{member_id}", response_model=MemberResponse)
-def get_member_admin(
+async def get_member_admin(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Admin must be able to fetch any member (visible or hidden)
-    member = (
-        db.query(Member)
-        .filter(Member.id == member_id)
-        .first()
-    )
+    member = await db.get(Member, member_id)
 
     if not member:
         raise HTTPException(
@@ -204,6 +265,12 @@ def get_member_admin(
             detail="Member not found",
         )
 
+    # Answer 304 if the client already has this version
+    validators = item_validators(request, member)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
+
     return member
 
 
@@ -231,6 +298,51 @@ def delete_member(
     # Step 2: Delete the member from the database
     db.delete(member)
     db.commit()
+    invalidate_responses("members")
 
     return {"message": "Member deleted successfully"}
 
+
+# 10. Create many members at once (import)
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_members(
+    payload: list[dict] = Body(
+        ...,
+        max_length=BULK_MAX_ITEMS,
+        description="MemberCreate objects, each one validated on its own",
+    ),
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_user),
+):
+    # Step 1: Validate every item, invalid ones get a failed result
+    items, results = validate_items(MemberCreate, payload)
+
+    # Step 2: Prepare the rows (members do not reference other tables)
+    # created_at / updated_at come from the column defaults, like the others
+    members = []
+    for index, item in items:
+        member_id = uuid4()
+        members.append({
+            "id": member_id,
+            "photo_url": item.photo_url,
+            "name": item.name,
+            "position": item.position,
+            "start_date": item.start_date,
+            "end_date": item.end_date,
+            "social_media": item.social_media.model_dump()
+            if item.social_media else None,
+            "contact_email": item.contact_email,
+            "personal_email": item.personal_email,
+            "contact_number": item.contact_number,
+            "is_visible": item.is_visible,
+            "role": item.role,
+        })
+        results.append(ok(index, member_id))
+
+    # Step 3: Save everything with one multi-row INSERT
+    if members:
+        db.execute(insert(Member), members)
+        db.commit()
+        invalidate_responses("members")
+
+    return bulk_result(results)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status # Tools to build the API
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.db.session import get_db
+from app.utils.response_cache import invalidate_responses
+from app.utils.pagination import PageParams, keyset, page_headers, split_page
+from app.utils.references import dependent_references, describe_references, references_conflict
 from app.auth.deps import get_current_user # To check if the user is logged in
 from app.models.training.mentor import Mentor
+from app.models.training.training import Training
 from app.models.training.training_mentor import TrainingMentor
 from app.schemas.mentor import MentorCreate, MentorUpdate, MentorResponse
 
@@ -17,17 +22,26 @@ router = APIRouter(
 @router.get("/", response_model=list[MentorResponse])
 # 1. Get a list of all mentors
 def list_mentors(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     
-    # Step 1: Get all mentors from the database and sort them by name
-    mentors = (
-        db.query(Mentor)
-        .order_by(Mentor.name.asc())
-        .all()
+    # Step 1: Get the mentors sorted by name (id breaks ties), all of them
+    # or one page with ?limit= / ?cursor=, so pages follow the same order
+    mentors, next_cursor = split_page(
+        keyset(db.query(Mentor), Mentor, page, sort_key="name", descending=False).all(),
+        page,
+        sort_key="name",
     )
 
+    # Step 2: Tell paginating clients where the next page starts
+    if page.limit is not None or page.cursor is not None:
+        total = db.query(Mentor).count() if page.include_total else None
+        response.headers.update(page_headers(request, page, next_cursor, total))
+
     return mentors
 
 @router.post("/", response_model=MentorResponse)
@@ -106,8 +120,17 @@ def update_mentor(
         else:
             setattr(mentor, field, value)
 
-    # Step 2: Save the updates
+    # Step 2: Mentor details are shown inside trainings, so mark those as updated
+    db.query(Training).filter(
+        Training.id.in_(
+            db.query(TrainingMentor.training_id)
+            .filter(TrainingMentor.mentor_id == mentor_id)
+        )
+    ).update({Training.updated_at: datetime.utcnow()}, synchronize_session=False)
+
+    # Step 3: Save the updates
     db.commit()
+    invalidate_responses("trainings")  # mentor names are shown inside trainings
     db.refresh(mentor)
 
     return mentor
@@ -129,19 +152,17 @@ def delete_mentor(
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
     
-    # check if mentor is assigned to any training
-    assigned_trainings = db.query(TrainingMentor).filter(TrainingMentor.mentor_id == mentor_id).all()
+    # check if mentor is assigned to any training (count + titles in one query)
+    dependents = dependent_references(
+        db,
+        mentor_id,
+        trainings=(TrainingMentor.mentor_id, Training.title),
+    )
     # if mentor has training
-    if assigned_trainings:
-        # get the training names
-        training_names = []
-        for tm in assigned_trainings:
-            training_names.append(tm.training.title)
-        
-        training_list = ", ".join(training_names)
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot delete mentor. Currently assigned to {len(assigned_trainings)} training(s): {training_list}"
+    if dependents:
+        return references_conflict(
+            f"Cannot delete mentor. Currently assigned to {describe_references(dependents)}",
+            dependents,
         )
     
     #  if not assigned delete mentor
@@ -0,0 +1,36 @@
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Response, status # Tools to build the API
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.config import METRICS_TOKEN
+from app.utils.metrics import render_metrics
+
+# Setup the router for the Prometheus scrape endpoint
+router = APIRouter(tags=["Metrics"])
+
+scraper = HTTPBearer(auto_error=False)
+
+
+# Only the scraper may read the metrics (route names, traffic, pool sizes):
+# it sends METRICS_TOKEN as a bearer token, not an admin JWT
+def require_metrics_token(credentials: HTTPAuthorizationCredentials = Depends(scraper)):
+    # Step 1: No token configured means the endpoint is switched off
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    # Step 2: Compare in constant time so the token cannot be guessed byte by byte
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# 1. Prometheus metrics (text exposition format)
+# async: the threadpool numbers must be read on the event loop
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
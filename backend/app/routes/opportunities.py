@@ -1,18 +1,35 @@
-from uuid import UUID # To handle unique IDs
-from fastapi import APIRouter, Depends, HTTPException, status
+import re
+from collections import defaultdict
+from datetime import datetime
+from uuid import UUID, uuid4 # To handle unique IDs
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.config import BULK_MAX_ITEMS
+from app.db.session import get_db, get_async_db
 from app.models.opportunities.opportunity import Opportunity
 from app.models.opportunities.job import JobDetail
 from app.models.opportunities.internship import InternshipDetail
 from app.models.opportunities.requirement import OpportunityRequirement
-from app.models.opportunities.enums import OpportunityType
+from app.models.opportunities.enums import OpportunityType, SearchMode
 from app.schemas.opportunities import (
     OpportunityCreate,
     OpportunityUpdate,
     OpportunityResponse,
 )
+from app.utils.response_cache import cached_response, invalidate_responses
+from app.schemas.bulk import BulkResult
+from app.utils.bulk import bulk_result, ok, validate_items
+from app.utils.pagination import PageParams, keyset, page_headers, split_page
+from app.utils.conditional import (
+    collection_validators,
+    is_not_modified,
+    item_validators,
+    json_response,
+    not_modified,
+)
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for all job and internship links
@@ -21,55 +38,107 @@ router = APIRouter(
     tags=["Admin Opportunities"],
 )
 
-# Helper function to format the data for the frontend
-def opportunity_response(
-    opportunity_obj: Opportunity,
+# Helper function to format many opportunities for the frontend at once.
+# Runs at most one query per table (requirements, job details, internship
+# details) no matter how many opportunities are passed in.
+def opportunity_responses(
+    opportunities: list[Opportunity],
     db: Session,
-) -> OpportunityResponse:
-    # Step 1: Get all requirements for this opportunity from the database
+) -> list[OpportunityResponse]:
+    if not opportunities:
+        return []
+
+    # Step 1: Get all requirements for these opportunities in one query
+    opportunity_ids = [op.id for op in opportunities]
+    requirements_by_opportunity = defaultdict(list)
     requirements = (
         db.query(OpportunityRequirement)
-        .filter_by(opportunity_id=opportunity_obj.id)
+        .filter(OpportunityRequirement.opportunity_id.in_(opportunity_ids))
         .order_by(OpportunityRequirement.order)
         .all()
     )
+    for requirement in requirements:
+        requirements_by_opportunity[requirement.opportunity_id].append(
+            requirement.text
+        )
 
-    job_details = None
-    internship_details = None
-
-    # Step 2: If it's a JOB, find its extra details (like salary)
-    if opportunity_obj.type == OpportunityType.JOB:
-        job = db.query(JobDetail).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).first()
+    # Step 2: Get the extra details for all JOBs in one query (like salary)
+    job_ids = [op.id for op in opportunities if op.type == OpportunityType.JOB]
+    jobs = {}
+    if job_ids:
+        jobs = {
+            job.opportunity_id: job
+            for job in db.query(JobDetail)
+            .filter(JobDetail.opportunity_id.in_(job_ids))
+            .all()
+        }
+
+    # Step 3: Get the extra details for all INTERNSHIPs in one query (like duration)
+    internship_ids = [
+        op.id for op in opportunities if op.type == OpportunityType.INTERNSHIP
+    ]
+    internships = {}
+    if internship_ids:
+        internships = {
+            internship.opportunity_id: internship
+            for internship in db.query(InternshipDetail)
+            .filter(InternshipDetail.opportunity_id.in_(internship_ids))
+            .all()
+        }
+
+    # Step 4: Put everything together for each opportunity
+    responses = []
+    for opportunity_obj in opportunities:
+        job_details = None
+        internship_details = None
+
+        job = jobs.get(opportunity_obj.id)
         if job:
             job_details = {
                 "employment_type": job.employment_type,
                 "salary_range": job.salary_range,
             }
 
-    # Step 3: If it's an INTERNSHIP, find its extra details (like duration)
-    if opportunity_obj.type == OpportunityType.INTERNSHIP:
-        internship = db.query(InternshipDetail).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).first()
+        internship = internships.get(opportunity_obj.id)
         if internship:
             internship_details = {
                 "duration_months": internship.duration_months,
                 "stipend": internship.stipend,
             }
 
-    return OpportunityResponse(
-        id=str(opportunity_obj.id),
-        title=opportunity_obj.title,
-        description=opportunity_obj.description,
-        location=opportunity_obj.location,
-        type=opportunity_obj.type,
-        job_details=job_details,
-        internship_details=internship_details,
-        created_at=opportunity_obj.created_at,
-        requirements=[r.text for r in requirements],
-    )
+        responses.append(
+            OpportunityResponse(
+                id=str(opportunity_obj.id),
+                title=opportunity_obj.title,
+                description=opportunity_obj.description,
+                location=opportunity_obj.location,
+                type=opportunity_obj.type,
+                job_details=job_details,
+                internship_details=internship_details,
+                created_at=opportunity_obj.created_at,
+                requirements=requirements_by_opportunity.get(opportunity_obj.id, []),
+            )
+        )
+
+    return responses
+
+
+# Helper function to format a single opportunity (same code path as the list)
+def opportunity_response(
+    opportunity_obj: Opportunity,
+    db: Session,
+) -> OpportunityResponse:
+    return opportunity_responses([opportunity_obj], db)[0]
+
+
+# Helper function to turn what the user typed into a full-text query.
+# Every word must match and the last one is a prefix, so "pyth dev" finds
+# "Python Developer" while the user is still typing.
+def search_tsquery(search: str):
+    words = re.findall(r"\w+", search)
+    if not words:
+        return None
+    return func.to_tsquery("english", " & ".join(words[:-1] + [words[-1] + ":*"]))
 
 
 @router.post(
@@ -123,6 +192,7 @@ def create_opportunity(
         )
 
     db.commit()
+    invalidate_responses("opportunities")
     db.refresh(new_opportunity)
 
     return opportunity_response(new_opportunity, db)
@@ -133,39 +203,81 @@ def create_opportunity(
     response_model=list[OpportunityResponse],
 )
 # 2. Get a list of all opportunities (with search and filters)
-def list_opportunities(
+@cached_response("opportunities")
+async def list_opportunities(
+    request: Request,
     type: OpportunityType | None = None,
     location: str | None = None,
     search: str | None = None,
-    db: Session = Depends(get_db),
+    search_mode: SearchMode = SearchMode.CONTAINS,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Start with a basic query
-    query = db.query(Opportunity)
+    # Step 1: Collect the filters the user provided in the URL
+    filters = []
 
-    # Step 2: Add filters if the user provided them in the URL
     if type is not None:
-        query = query.filter(Opportunity.type == type)
+        filters.append(Opportunity.type == type)
 
     if location:
-        query = query.filter(
+        filters.append(
             Opportunity.location.ilike(f"%{location}%") # ilike means "search case-insensitive"
         )
 
-    if search:
-        query = query.filter(
+    # Both ILIKE filters are served by the trigram indexes on title/location
+    ts_query = None
+    if search and search_mode == SearchMode.RANKED:
+        # Full-text match on title, description and requirements (GIN index)
+        ts_query = search_tsquery(search)
+        if ts_query is not None:
+            filters.append(Opportunity.search_vector.op("@@")(ts_query))
+    elif search:
+        filters.append(
             Opportunity.title.ilike(f"%{search}%")
         )
 
-    # Step 3: Get the final list, newest first
-    opportunities = query.order_by(
-        Opportunity.created_at.desc()
-    ).all()
+    if ts_query is not None and page.cursor:
+        # rank order has no stable (created_at, id) position to continue from
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor pagination is not supported for ranked search",
+        )
 
-    return [
-        opportunity_response(op, db)
-        for op in opportunities
-    ]
+    # Step 2: Answer 304 if the filtered list did not change
+    validators = await collection_validators(request, db, Opportunity, *filters)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+
+    # Step 3: Get the final list
+    query = select(Opportunity).where(*filters)
+    if ts_query is not None:
+        # ranked search: best matches first, top ?limit= results
+        query = query.order_by(
+            func.ts_rank_cd(Opportunity.search_vector, ts_query).desc(),
+            Opportunity.created_at.desc(),
+            Opportunity.id.desc(),
+        )
+        if page.limit is not None:
+            query = query.limit(page.limit)
+        opportunities, next_cursor = (await db.scalars(query)).all(), None
+    else:
+        # one page when ?limit= is given, newest first
+        opportunities, next_cursor = split_page(
+            (await db.scalars(keyset(query, Opportunity, page))).all(),
+            page,
+        )
+
+    # Step 4: Load requirements and details for the whole list in bulk
+    responses = await db.run_sync(
+        lambda session: opportunity_responses(opportunities, session)
+    )
+    return json_response(
+        list[OpportunityResponse],
+        responses,
+        validators,
+        page_headers(request, page, next_cursor, validators.count),
+    )
 
 
 @router.get(
@@ -173,15 +285,25 @@ def list_opportunities(
     response_model=OpportunityResponse,
 )
 # 3. Get details of one specific opportunity
-def get_opportunity(
+async def get_opportunity(
     opportunity_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    opportunity_obj = db.get(Opportunity, opportunity_id)
+    opportunity_obj = await db.get(Opportunity, opportunity_id)
     if not opportunity_obj:
         raise HTTPException(status_code=404, detail="Opportunity not found")
 
-    return opportunity_response(opportunity_obj, db)
+    # Answer 304 if the client already has this version
+    validators = item_validators(request, opportunity_obj)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
+
+    return await db.run_sync(
+        lambda session: opportunity_response(opportunity_obj, session)
+    )
 
 
 @router.patch(
@@ -205,6 +327,9 @@ def update_opportunity(
         if value is not None:
             setattr(opportunity_obj, field, value)
 
+    # Always bump updated_at: detail/requirement changes don't touch the row itself
+    opportunity_obj.updated_at = datetime.utcnow()
+
     # Step 2: Update the extra details (Job or Internship)
     if opportunity_obj.type == OpportunityType.JOB and payload.job_details:
         job = db.query(JobDetail).filter_by(
@@ -238,6 +363,7 @@ def update_opportunity(
             )
 
     db.commit()
+    invalidate_responses("opportunities")
     db.refresh(opportunity_obj)
     return opportunity_response(opportunity_obj, db)
 
@@ -259,3 +385,68 @@ def delete_opportunity(
 
     db.delete(opportunity_obj)
     db.commit()
+    invalidate_responses("opportunities")
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+)
+# 6. Create many Jobs and Internships at once (import)
+def bulk_create_opportunities(
+    payload: list[dict] = Body(
+        ...,
+        max_length=BULK_MAX_ITEMS,
+        description="OpportunityCreate objects, each one validated on its own",
+    ),
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_user),
+):
+    # Step 1: Validate every item (including its Job/Internship details),
+    # invalid ones get a failed result
+    items, results = validate_items(OpportunityCreate, payload)
+
+    # Step 2: Prepare the rows for every table
+    opportunities, jobs, internships, requirements = [], [], [], []
+    for index, item in items:
+        opportunity_id = uuid4()
+        opportunities.append({
+            "id": opportunity_id,
+            "title": item.title,
+            "description": item.description,
+            "location": item.location,
+            "type": item.type,
+        })
+
+        if item.type == OpportunityType.JOB:
+            jobs.append({
+                "opportunity_id": opportunity_id,
+                "employment_type": item.job_details.employment_type,
+                "salary_range": item.job_details.salary_range,
+            })
+        elif item.type == OpportunityType.INTERNSHIP:
+            internships.append({
+                "opportunity_id": opportunity_id,
+                "duration_months": item.internship_details.duration_months,
+                "stipend": item.internship_details.stipend,
+            })
+
+        requirements += [
+            {"opportunity_id": opportunity_id, "text": text, "order": idx}
+            for idx, text in enumerate(item.requirements)
+        ]
+        results.append(ok(index, opportunity_id))
+
+    # Step 3: Save everything with multi-row INSERTs in one transaction
+    if opportunities:
+        db.execute(insert(Opportunity), opportunities)
+        if jobs:
+            db.execute(insert(JobDetail), jobs)
+        if internships:
+            db.execute(insert(InternshipDetail), internships)
+        if requirements:
+            db.execute(insert(OpportunityRequirement), requirements)
+        db.commit()
+        invalidate_responses("opportunities")
+
+    return bulk_result(results)
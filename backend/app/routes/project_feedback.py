@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status # Tools to build the API
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -6,6 +7,8 @@ from app.db.session import get_db
 from app.models.projects.project import Project
 from app.models.projects.feedback import ProjectFeedback
 from app.schemas.projects import FeedbackCreate, FeedbackResponse
+from app.utils.response_cache import invalidate_responses
+from app.utils.pagination import PageParams, keyset, page_headers, split_page
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for project reviews (feedbacks)
@@ -49,8 +52,11 @@ def create_project_feedback(
     )
 
     # Step 3: Save to database
+    # (feedbacks are part of the project response, so the project counts as updated)
+    project.updated_at = datetime.utcnow()
     db.add(feedback)
     db.commit()
+    invalidate_responses("projects")  # feedbacks are shown inside projects
     db.refresh(feedback)
 
     return feedback
@@ -62,6 +68,9 @@ def create_project_feedback(
 )
 def list_project_feedbacks(
     project_id: UUID,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
    
 ):
@@ -78,13 +87,14 @@ def list_project_feedbacks(
             detail="Project not found",
         )
 
-    # Step 2: Get all reviews for this project, newest first
-    feedbacks = (
-        db.query(ProjectFeedback)
-        .filter(ProjectFeedback.project_id == project_id)
-        .order_by(ProjectFeedback.created_at.desc())
-        .all()
+    # Step 2: Get the reviews for this project (one page when ?limit= is given), newest first
+    query = db.query(ProjectFeedback).filter(ProjectFeedback.project_id == project_id)
+    feedbacks, next_cursor = split_page(
+        keyset(query, ProjectFeedback, page).all(),
+        page,
     )
+    total = query.count() if page.include_total else None
+    response.headers.update(page_headers(request, page, next_cursor, total))
 
     return feedbacks
 
@@ -112,8 +122,13 @@ def delete_project_feedback(
         )
 
     # Step 2: Delete the review and save changes
+    # (feedbacks are part of the project response, so the project counts as updated)
+    db.query(Project).filter(Project.id == feedback.project_id).update(
+        {Project.updated_at: datetime.utcnow()}
+    )
     db.delete(feedback)
     db.commit()
+    invalidate_responses("projects")  # feedbacks are shown inside projects
     return
 
 
@@ -1,18 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
+from collections import defaultdict
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status # Tools to build the API
+from sqlalchemy import any_, bindparam, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from app.db.session import get_db
-from app.models.projects.project import Project
+from app.config import BULK_MAX_ITEMS
+from app.db.session import get_db, get_async_db
 from app.models.projects.feedback import ProjectFeedback
+from app.models.projects.project import Project
 from app.models.projects.project_tech_map import ProjectTechMap
 from app.models.services.service_teck import ServiceTech
 from app.schemas.projects import ProjectCreate, ProjectResponse, ProjectUpdate
+from app.schemas.bulk import BulkResult
+from app.utils.response_cache import cached_response, invalidate_responses
+from app.utils.bulk import bulk_result, existing_ids, failed, ok, validate_items
+from app.utils.pagination import PageParams, keyset, page_headers, split_page
+from app.utils.conditional import (
+    collection_validators,
+    is_not_modified,
+    item_validators,
+    json_response,
+    not_modified,
+)
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for all project-related links
 router = APIRouter(prefix="/admin/projects", tags=["Projects"])
 
+# ---------- shared relation loading (used by LIST, GET, UPDATE) ----------
+# Helper function to load tech names and feedbacks for many projects at once.
+# Always runs exactly 2 queries (one "= ANY(:ids)" query per relation with
+# all ids in one array parameter), no matter how many projects are passed in.
+# selectinload would split the ids into IN queries of 500, so the full list
+# grew by 2 queries per 500 projects.
+# Takes a sync Session; the async routes call it through db.run_sync().
+def load_project_relations(
+    db: Session,
+    project_ids: list[UUID],
+) -> tuple[dict[UUID, list[str]], dict[UUID, list[ProjectFeedback]]]:
+    techs_by_project: dict[UUID, list[str]] = defaultdict(list)
+    feedbacks_by_project: dict[UUID, list[ProjectFeedback]] = defaultdict(list)
+
+    if not project_ids:
+        return techs_by_project, feedbacks_by_project
+
+    ids = bindparam("project_ids", list(project_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+
+    # Step 1: Get all technology names for these projects in one query
+    tech_rows = db.execute(
+        select(ProjectTechMap.project_id, ServiceTech.name)
+        .join(ServiceTech, ServiceTech.id == ProjectTechMap.tech_id)
+        .where(ProjectTechMap.project_id == any_(ids))
+    ).all()
+    for project_id, name in tech_rows:
+        techs_by_project[project_id].append(name)
+
+    # Step 2: Get all client reviews for these projects in one query
+    feedbacks = db.scalars(
+        select(ProjectFeedback).where(ProjectFeedback.project_id == any_(ids))
+    ).all()
+    for feedback in feedbacks:
+        feedbacks_by_project[feedback.project_id].append(feedback)
+
+    return techs_by_project, feedbacks_by_project
+
+
+# ---------- shared api response (used by LIST, GET, UPDATE) ----------
+# Helper function to format the project data for the frontend
+def project_response(
+    project: Project,
+    techs: list[str],
+    feedbacks: list[ProjectFeedback],
+) -> ProjectResponse:
+    return ProjectResponse(
+        id=project.id,
+        title=project.title,
+        description=project.description,
+        photo_url=project.photo_url,
+        techs=techs,
+        project_link=project.project_link,
+        feedbacks=[
+            {
+                "id": f.id,
+                "client_name": f.client_name,
+                "client_photo": f.client_photo,
+                "feedback_description": f.feedback_description,
+                "rating": f.rating,
+            }
+            for f in feedbacks
+        ],
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+    )
+
+
+def project_responses(db: Session, projects: list[Project]) -> list[ProjectResponse]:
+    techs_by_project, feedbacks_by_project = load_project_relations(
+        db, [project.id for project in projects]
+    )
+    return [
+        project_response(
+            project,
+            techs_by_project.get(project.id, []),
+            feedbacks_by_project.get(project.id, []),
+        )
+        for project in projects
+    ]
+
+
 # 1. Create a new project
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(
@@ -55,6 +153,7 @@ def create_project(
         )
     
     db.commit()
+    invalidate_responses("projects")
     db.refresh(project)
 
     return ProjectResponse(
@@ -71,69 +170,43 @@ def create_project(
 
 # 2. Get a list of all projects
 @router.get("/", response_model=list[ProjectResponse])
-def list_projects(
-    db: Session = Depends(get_db),
+@cached_response("projects")
+async def list_projects(
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Get all projects from the database
-    projects = db.query(Project).all()
-    responses = []
-
-    for project in projects:
-        # Step 2: For each project, find its technology names
-        techs = (
-            db.query(ServiceTech.name)
-            .join(ProjectTechMap, ProjectTechMap.tech_id == ServiceTech.id)
-            .filter(ProjectTechMap.project_id == project.id)
-            .all()
-        )
-
-        # Step 3: Find all reviews (feedbacks) for this project
-        feedbacks = (
-            db.query(ProjectFeedback)
-            .filter(ProjectFeedback.project_id == project.id)
-            .all()
-        )
-
-        # Step 4: Add the project details to the final list
-        responses.append(
-            ProjectResponse(
-                id=project.id,
-                title=project.title,
-                description=project.description,
-                photo_url=project.photo_url,
-                techs=[t[0] for t in techs],
-                project_link=project.project_link,
-                feedbacks=[
-                    {
-                        "id": f.id,
-                        "client_name": f.client_name,
-                        "client_photo": f.client_photo,
-                        "feedback_description": f.feedback_description,
-                        "rating": f.rating,
-                    }
-                    for f in feedbacks
-                ],
-                created_at=project.created_at,
-                updated_at=project.updated_at,
-            )
-        )
+    # Step 1: Answer 304 if the list did not change since the client's copy
+    validators = await collection_validators(request, db, Project)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+
+    # Step 2: Get all projects (one page when ?limit= is given, newest first)
+    projects, next_cursor = split_page(
+        (await db.scalars(keyset(select(Project), Project, page))).all(),
+        page,
+    )
 
-    return responses
+    # Step 3: Load their techs and reviews (2 queries total) and format them
+    return json_response(
+        list[ProjectResponse],
+        await db.run_sync(project_responses, projects),
+        validators,
+        page_headers(request, page, next_cursor, validators.count),
+    )
 
 # 3. Get details of one specific project
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project_detail(
+async def get_project_detail(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Find the project in the database
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id)
-        .first()
-    )
+    project = await db.get(Project, project_id)
 
     if not project:
         raise HTTPException(
@@ -141,41 +214,15 @@ def get_project_detail(
             detail="Project not found",
         )
 
-    # Step 2: Find its technology names
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ProjectTechMap, ProjectTechMap.tech_id == ServiceTech.id)
-        .filter(ProjectTechMap.project_id == project.id)
-        .all()
-    )
+    # Step 2: Answer 304 if the client already has this version
+    validators = item_validators(request, project)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
 
-    # Step 3: Find its reviews (feedbacks)
-    feedbacks = (
-        db.query(ProjectFeedback)
-        .filter(ProjectFeedback.project_id == project.id)
-        .all()
-    )
-
-    return ProjectResponse(
-        id=project.id,
-        title=project.title,
-        description=project.description,
-        photo_url=project.photo_url,
-        techs=[t[0] for t in techs],
-        project_link=project.project_link,
-        feedbacks=[
-            {
-                "id": f.id,
-                "client_name": f.client_name,
-                "client_photo": f.client_photo,
-                "feedback_description": f.feedback_description,
-                "rating": f.rating,
-            }
-            for f in feedbacks
-        ],
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-    )
+    # Step 3: Load its techs and reviews
+    (project_data,) = await db.run_sync(project_responses, [project])
+    return project_data
 
 
 # 4. Update an existing project
@@ -205,6 +252,9 @@ def update_project(
     ).items():
         if field != "tech_ids":
             setattr(project, field, value)
+
+    # Always bump updated_at: tech changes don't touch the row itself
+    project.updated_at = datetime.utcnow()
     
     # Step 2: Update the technology list if provided
     if payload.tech_ids is not None:
@@ -234,41 +284,11 @@ def update_project(
             )
             
     db.commit()
-    db.refresh(project)
+    invalidate_responses("projects")
 
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ProjectTechMap, ProjectTechMap.tech_id == ServiceTech.id)
-        .filter(ProjectTechMap.project_id == project.id)
-        .all()
-    )
-
-    feedbacks = (
-        db.query(ProjectFeedback)
-        .filter(ProjectFeedback.project_id == project.id)
-        .all()
-    )
-
-    return ProjectResponse(
-        id=project.id,
-        title=project.title,
-        description=project.description,
-        photo_url=project.photo_url,
-        techs=[t[0] for t in techs],
-        project_link=project.project_link,
-        feedbacks=[
-            {
-                "id": f.id,
-                "client_name": f.client_name,
-                "client_photo": f.client_photo,
-                "feedback_description": f.feedback_description,
-                "rating": f.rating,
-            }
-            for f in feedbacks
-        ],
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-    )
+    # Step 4: Load the project's techs and reviews
+    (project_data,) = project_responses(db, [project])
+    return project_data
 
 # 5. Delete a project
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -298,5 +318,58 @@ def delete_project(
     # Step 3: Delete the project (reviews are deleted automatically)
     db.delete(project)
     db.commit()
+    invalidate_responses("projects")
 
     return
+
+
+# 6. Create many projects at once (catalog import)
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_projects(
+    payload: list[dict] = Body(
+        ...,
+        max_length=BULK_MAX_ITEMS,
+        description="ProjectCreate objects, each one validated on its own",
+    ),
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_user),
+):
+    # Step 1: Validate every item, invalid ones get a failed result
+    items, results = validate_items(ProjectCreate, payload)
+
+    # Step 2: Check every referenced tech in one query
+    found = existing_ids(
+        db,
+        tech=(ServiceTech, {tech_id for _, item in items for tech_id in item.tech_ids}),
+    )
+
+    # Step 3: Prepare the rows of the valid items, report the others
+    projects, tech_links = [], []
+    for index, item in items:
+        if not found["tech"].issuperset(item.tech_ids):
+            results.append(failed(index, "One or more tech IDs are invalid"))
+            continue
+
+        project_id = uuid4()
+        projects.append({
+            "id": project_id,
+            "title": item.title,
+            "description": item.description,
+            "photo_url": item.photo_url,
+            "project_link": item.project_link,
+        })
+        tech_links += [
+            {"project_id": project_id, "tech_id": tech_id}
+            for tech_id in dict.fromkeys(item.tech_ids)  # drop duplicates, keep order
+        ]
+        results.append(ok(index, project_id))
+
+    # Step 4: Save everything with multi-row INSERTs in one transaction
+    if projects:
+        db.execute(insert(Project), projects)
+        if tech_links:
+            db.execute(insert(ProjectTechMap), tech_links)
+        db.commit()
+        invalidate_responses("projects")
+
+    return bulk_result(results)
@@ -5,7 +5,9 @@ from uuid import UUID
 from app.db.session import get_db
 from app.auth.deps import get_current_user # To check if the user is logged in
 from app.models.services.service_offer import ServiceOffering
+from app.models.services.service import Service
 from app.models.services.service_offer_map import ServiceOfferingMap
+from app.utils.references import dependent_references, describe_references, references_conflict
 from app.schemas.service_offering import (
     ServiceOfferingCreate,
     ServiceOfferingResponse,
@@ -79,15 +81,18 @@ def delete_service_offering(
     if not offering:
         raise HTTPException(status_code=404, detail="Service offering not found")
     
-    # Check if offering is used by any services
-    services_using_offering = db.query(ServiceOfferingMap).filter(ServiceOfferingMap.offering_id == offering_id).all()
+    # Check if offering is used by any services (count + titles in one query)
+    dependents = dependent_references(
+        db,
+        offering_id,
+        services=(ServiceOfferingMap.offering_id, Service.title),
+    )
     
     # If offering is used, prevent deletion
-    if services_using_offering:
-        service_count = len(services_using_offering)
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot delete offering. Currently used by {service_count} service(s). Remove from services first."
+    if dependents:
+        return references_conflict(
+            f"Cannot delete offering. Currently used by {describe_references(dependents)}. Remove from services first.",
+            dependents,
         )
     
     # If not used, safe to delete
@@ -5,7 +5,11 @@ from uuid import UUID
 from app.db.session import get_db
 from app.auth.deps import get_current_user # To check if the user is logged in
 from app.models.services.service_teck import ServiceTech
+from app.models.services.service import Service
 from app.models.services.service_tech_map import ServiceTechMap
+from app.models.projects.project import Project
+from app.models.projects.project_tech_map import ProjectTechMap
+from app.utils.references import dependent_references, describe_references, references_conflict
 from app.schemas.service_tech import (
     ServiceTechCreate,
     ServiceTechResponse,
@@ -69,8 +73,8 @@ def delete_service_tech(
     admin = Depends(get_current_user),
 ):
     """
-    Delete a technology only if it's not used by any service.
-    If used, returns error with list of service names.
+    Delete a technology only if it's not used by any service or project.
+    If used, returns error with list of service and project names.
     """
     # Find the technology in database
     tech = db.query(ServiceTech).filter(ServiceTech.id == tech_id).first()
@@ -78,15 +82,19 @@ def delete_service_tech(
     if not tech:
         raise HTTPException(status_code=404, detail="Technology not found")
     
-    # Check if technology is used by any services
-    services_using_tech = db.query(ServiceTechMap).filter(ServiceTechMap.tech_id == tech_id).all()
+    # Check if technology is used by any services or projects (one query)
+    dependents = dependent_references(
+        db,
+        tech_id,
+        services=(ServiceTechMap.tech_id, Service.title),
+        projects=(ProjectTechMap.tech_id, Project.title),
+    )
     
     # If technology is used, prevent deletion
-    if services_using_tech:
-        service_count = len(services_using_tech)
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot delete technology. Currently used by {service_count} service(s). Remove from services first."
+    if dependents:
+        return references_conflict(
+            f"Cannot delete technology. Currently used by {describe_references(dependents)}. Remove it from them first.",
+            dependents,
         )
     
     # If not used, safe to delete
@@ -1,19 +1,112 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
+from collections import defaultdict
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status # Tools to build the API
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from app.db.session import get_db
+from app.config import BULK_MAX_ITEMS
+from app.db.session import get_db, get_async_db
 from app.models.services.service import Service
 from app.models.services.service_teck import ServiceTech
 from app.models.services.service_tech_map import ServiceTechMap
 from app.models.services.service_offer import ServiceOffering
 from app.models.services.service_offer_map import ServiceOfferingMap
 from app.schemas.Services import ServiceCreate, ServiceResponse, ServiceUpdate
+from app.schemas.bulk import BulkResult
+from app.schemas.pricing import RepriceResult, ServiceRepriceRequest
+from app.utils.response_cache import cached_response, invalidate_responses
+from app.utils.bulk import bulk_result, existing_ids, failed, ok, validate_items
+from app.utils.pagination import PageParams, keyset, page_headers, split_page
+from app.utils.pricing import PriceParams, price_filters, price_order
+from app.utils.repricing import reprice
+from app.utils.conditional import (
+    collection_validators,
+    is_not_modified,
+    item_validators,
+    json_response,
+    not_modified,
+)
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for all service-related links
 router = APIRouter(prefix="/admin/services", tags=["Services"])
 
+# ---------- shared relation loading (used by LIST, GET, UPDATE) ----------
+# Helper function to load tech and offering names for many services at once.
+# Always runs exactly 2 queries (one IN query per join table), no matter
+# how many services are passed in, so the list page does not do N+1 queries.
+def load_service_relations(
+    db: Session,
+    service_ids: list[UUID],
+) -> tuple[dict[UUID, list[str]], dict[UUID, list[str]]]:
+    techs_by_service: dict[UUID, list[str]] = defaultdict(list)
+    offerings_by_service: dict[UUID, list[str]] = defaultdict(list)
+
+    if not service_ids:
+        return techs_by_service, offerings_by_service
+
+    # Step 1: Get all technology names for these services in one query
+    tech_rows = (
+        db.query(ServiceTechMap.service_id, ServiceTech.name)
+        .join(ServiceTech, ServiceTech.id == ServiceTechMap.tech_id)
+        .filter(ServiceTechMap.service_id.in_(service_ids))
+        .all()
+    )
+    for service_id, name in tech_rows:
+        techs_by_service[service_id].append(name)
+
+    # Step 2: Get all offering names for these services in one query
+    offering_rows = (
+        db.query(ServiceOfferingMap.service_id, ServiceOffering.name)
+        .join(ServiceOffering, ServiceOffering.id == ServiceOfferingMap.offering_id)
+        .filter(ServiceOfferingMap.service_id.in_(service_ids))
+        .all()
+    )
+    for service_id, name in offering_rows:
+        offerings_by_service[service_id].append(name)
+
+    return techs_by_service, offerings_by_service
+
+
+# ---------- shared api response (used by CREATE, LIST, GET, UPDATE) ----------
+# Helper function to format the service data for the frontend
+def service_response(
+    service: Service,
+    techs: list[str],
+    offerings: list[str],
+) -> ServiceResponse:
+    # Explicit response to avoid leaking DB structure
+    return ServiceResponse(
+        id=service.id,
+        title=service.title,
+        description=service.description,
+        photo_url=service.photo_url,
+        techs=techs,
+        offerings=offerings,
+        base_price=service.base_price,
+        effective_price=service.effective_price,
+        created_at=service.created_at,
+        updated_at=service.updated_at,
+    )
+
+
+# Helper function to build responses for a list of services in bulk
+def service_responses(db: Session, services: list[Service]) -> list[ServiceResponse]:
+    techs_by_service, offerings_by_service = load_service_relations(
+        db, [service.id for service in services]
+    )
+    return [
+        service_response(
+            service,
+            techs_by_service.get(service.id, []),
+            offerings_by_service.get(service.id, []),
+        )
+        for service in services
+    ]
+
+
 # 1. Create a new service
 @router.post("/", response_model=ServiceResponse, status_code=status.HTTP_201_CREATED)
 def create_service(
@@ -73,83 +166,68 @@ def create_service(
     
     # Commit once to keep write atomic
     db.commit()
+    invalidate_responses("services")
     db.refresh(service)
 
-    # Explicit response to avoid leaking DB structure
-    return ServiceResponse(
-        id=service.id,
-        title=service.title,
-        description=service.description,
-        photo_url=service.photo_url,
+    return service_response(
+        service,
         techs=[tech.name for tech in techs],
         offerings=[offering.name for offering in offerings],
-        base_price=service.base_price,
-        effective_price=service.effective_price,
-        created_at=service.created_at,
-        updated_at=service.updated_at,
     )
 
 # List all services with their tech stacks and offerings
 # 2. Get a list of all services
 @router.get("/", response_model=list[ServiceResponse])
-def list_services(
-    db: Session = Depends(get_db),
+@cached_response("services")
+async def list_services(
+    request: Request,
+    page: PageParams = Depends(),
+    prices: PriceParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Get all services from the database
-    services = db.query(Service).all()
-    responses = []
-
-    for service in services:
-        # Step 2: For each service, find its technology names
-        techs = (
-            db.query(ServiceTech.name)
-            .join(ServiceTechMap)
-            .filter(ServiceTechMap.service_id == service.id)
-            .all()
-        )
-
-        # Step 3: Find all features (offerings) for this service
-        offerings = (
-            db.query(ServiceOffering.name)
-            .join(ServiceOfferingMap)
-            .filter(ServiceOfferingMap.service_id == service.id)
-            .all()
-        )
-
-        # Step 4: Add the service details to the final list
-        responses.append(
-            ServiceResponse(
-                id=service.id,
-                title=service.title,
-                description=service.description,
-                photo_url=service.photo_url,
-                techs=[t[0] for t in techs],
-                offerings=[o[0] for o in offerings],
-                base_price=service.base_price,
-                effective_price=service.effective_price,
-                created_at=service.created_at,
-                updated_at=service.updated_at,
+    # Step 1: Answer 304 if the list did not change since the client's copy
+    filters = price_filters(Service, prices)
+    validators = await collection_validators(request, db, Service, *filters)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+
+    # Step 2: Get the services (one page when ?limit= is given),
+    # newest first or by price (?sort=price / price_desc)
+    sort_key, descending = price_order(prices)
+    services, next_cursor = split_page(
+        (
+            await db.scalars(
+                keyset(select(Service).where(*filters), Service, page, sort_key, descending)
             )
-        )
+        ).all(),
+        page,
+        sort_key,
+    )
 
-    return responses
+    # Step 3: Load techs and offerings for all services in bulk (2 queries total)
+    # run_sync reuses the shared helper without blocking the event loop
+    responses = await db.run_sync(service_responses, services)
+    return json_response(
+        list[ServiceResponse],
+        responses,
+        validators,
+        page_headers(request, page, next_cursor, validators.count),
+    )
 
 
 # get service details by id
 # 3. Get details of one specific service
 @router.get("/{service_id}", response_model=ServiceResponse)
-def get_service(
+async def get_service(
     service_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Find the service in the database
-    service = (
-        db.query(Service)
-        .filter(Service.id == service_id)
-        .first()
-    )
+    service = await db.get(Service, service_id)
 
     if not service:
         raise HTTPException(
@@ -157,34 +235,14 @@ def get_service(
             detail="Service not found",
         )
 
-    # Step 2: Find its technology names
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ServiceTechMap)
-        .filter(ServiceTechMap.service_id == service.id)
-        .all()
-    )
-
-    # Step 3: Find its features (offerings)
-    offerings = (
-        db.query(ServiceOffering.name)
-        .join(ServiceOfferingMap)
-        .filter(ServiceOfferingMap.service_id == service.id)
-        .all()
-    )
+    # Step 2: Answer 304 if the client already has this version
+    validators = item_validators(request, service)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
 
-    return ServiceResponse(
-        id=service.id,
-        title=service.title,
-        description=service.description,
-        photo_url=service.photo_url,
-        techs=[t[0] for t in techs],
-        offerings=[o[0] for o in offerings],
-        base_price=service.base_price,
-        effective_price=service.effective_price,
-        created_at=service.created_at,
-        updated_at=service.updated_at,
-    )
+    # Step 3: Load its technology and offering names
+    return (await db.run_sync(service_responses, [service]))[0]
 
 
 # 4. Update an existing service
@@ -213,6 +271,10 @@ def update_service(
             continue
         setattr(service, field, value)
 
+    # Always bump updated_at: tech/offering changes don't touch the row itself
+    # (ETags are built from it)
+    service.updated_at = datetime.utcnow()
+
     # Step 2: Update the technology list if provided
     if payload.tech_ids is not None:
         # Clear existing tech relations
@@ -269,34 +331,10 @@ def update_service(
                     )
                 )
     db.commit()
+    invalidate_responses("services")
     db.refresh(service)
 
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ServiceTechMap)
-        .filter(ServiceTechMap.service_id == service.id)
-        .all()
-    )
-
-    offerings = (
-        db.query(ServiceOffering.name)
-        .join(ServiceOfferingMap)
-        .filter(ServiceOfferingMap.service_id == service.id)
-        .all()
-    )
-
-    return ServiceResponse(
-        id=service.id,
-        title=service.title,
-        description=service.description,
-        photo_url=service.photo_url,
-        techs=[t[0] for t in techs],
-        offerings=[o[0] for o in offerings],
-        base_price=service.base_price,
-        effective_price=service.effective_price,
-        created_at=service.created_at,
-        updated_at=service.updated_at,
-    )
+    return service_responses(db, [service])[0]
 
 
 # 5. Delete a service
@@ -324,7 +362,108 @@ def delete_service(
     # Step 3: Delete the service and save changes
     db.delete(service)
     db.commit()
+    invalidate_responses("services")
 
     return {"message": "Service deleted successfully", "id": service_id}
 
 
+# 6. Create many services at once (catalog import)
+@router.post("/bulk", response_model=BulkResult)
+def bulk_create_services(
+    payload: list[dict] = Body(
+        ...,
+        max_length=BULK_MAX_ITEMS,
+        description="ServiceCreate objects, each one validated on its own",
+    ),
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_user),
+):
+    # Step 1: Validate every item, invalid ones get a failed result
+    items, results = validate_items(ServiceCreate, payload)
+
+    # Step 2: Check every referenced tech and offering in one query
+    found = existing_ids(
+        db,
+        tech=(ServiceTech, {tech_id for _, item in items for tech_id in item.tech_ids}),
+        offering=(ServiceOffering, {offering_id for _, item in items for offering_id in item.offering_ids}),
+    )
+
+    # Step 3: Prepare the rows of the valid items, report the others
+    services, tech_links, offering_links = [], [], []
+    for index, item in items:
+        if not found["tech"].issuperset(item.tech_ids):
+            results.append(failed(index, "One or more tech IDs are invalid"))
+            continue
+        if not found["offering"].issuperset(item.offering_ids):
+            results.append(failed(index, "One or more offering IDs are invalid"))
+            continue
+
+        service_id = uuid4()
+        services.append({
+            "id": service_id,
+            "title": item.title,
+            "description": item.description,
+            "photo_url": item.photo_url,
+            "base_price": item.base_price,
+            "discount_type": item.discount_type,
+            "discount_value": item.discount_value,
+        })
+        tech_links += [
+            {"service_id": service_id, "tech_id": tech_id}
+            for tech_id in dict.fromkeys(item.tech_ids)  # drop duplicates, keep order
+        ]
+        offering_links += [
+            {"service_id": service_id, "offering_id": offering_id}
+            for offering_id in dict.fromkeys(item.offering_ids)
+        ]
+        results.append(ok(index, service_id))
+
+    # Step 4: Save everything with multi-row INSERTs in one transaction
+    if services:
+        db.execute(insert(Service), services)
+        if tech_links:
+            db.execute(insert(ServiceTechMap), tech_links)
+        if offering_links:
+            db.execute(insert(ServiceOfferingMap), offering_links)
+        db.commit()
+        invalidate_responses("services")
+
+    return bulk_result(results)
+
+
+# 7. Set one discount on many services at once (seasonal promotions)
+@router.post("/reprice", response_model=RepriceResult)
+def reprice_services(
+    payload: ServiceRepriceRequest,
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_user),
+):
+    # Step 1: Check the filter techs and offerings in one query
+    found = existing_ids(
+        db,
+        tech=(ServiceTech, payload.tech_ids),
+        offering=(ServiceOffering, payload.offering_ids),
+    )
+    if not found["tech"].issuperset(payload.tech_ids):
+        raise HTTPException(status_code=400, detail="One or more tech IDs are invalid")
+    if not found["offering"].issuperset(payload.offering_ids):
+        raise HTTPException(status_code=400, detail="One or more offering IDs are invalid")
+
+    # Step 2: Services using any of the techs and any of the offerings
+    filters = []
+    if payload.tech_ids:
+        filters.append(Service.id.in_(
+            select(ServiceTechMap.service_id).where(ServiceTechMap.tech_id.in_(payload.tech_ids))
+        ))
+    if payload.offering_ids:
+        filters.append(Service.id.in_(
+            select(ServiceOfferingMap.service_id).where(ServiceOfferingMap.offering_id.in_(payload.offering_ids))
+        ))
+
+    # Step 3: Preview the new prices, save them unless it is a dry run
+    result = reprice(db, Service, payload, *filters)
+    if not payload.dry_run:
+        db.commit()
+        invalidate_responses("services")
+
+    return result
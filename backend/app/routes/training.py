@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query # Tools to build the API
-from app.db.session import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response # Tools to build the API
+from app.db.session import get_db, get_async_db
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from app.schemas.training import TrainingCreate, TrainingUpdate, TrainingResponse, MentorResponse
+from app.schemas.pricing import RepriceResult, TrainingRepriceRequest
+from app.utils.response_cache import cached_response, invalidate_responses
+from app.utils.pagination import PageParams, keyset, split_page
+from app.utils.bulk import existing_ids
+from app.utils.pricing import PriceParams, price_filters, price_order
+from app.utils.repricing import reprice
+from app.utils.conditional import (
+    collection_validators,
+    is_not_modified,
+    item_validators,
+    json_response,
+    not_modified,
+)
 from app.auth.deps import get_current_user # To check if the user is logged in
 from typing import List
-from decimal import Decimal
 from app.models.training.training import Training
 from app.models.training.benefit import TrainingBenefit
 from app.models.training.mentor import Mentor
 from app.models.training.training_mentor import TrainingMentor
-from app.models.pricing.enums import DiscountType
 from uuid import UUID
 
 # Setup the router for all training and course links
@@ -17,30 +31,17 @@ router = APIRouter(
     prefix="/admin/trainings",
     tags=["Trainings"]
 )
-# ---------- shared pricing logic (single source of truth) ----------
-# Helper function to calculate the final price after discount
-def calculate_effective_price(base_price: Decimal, discount_value: Decimal, discount_type: DiscountType | None,) -> Decimal:
-    if not discount_value or not discount_type:
-        return base_price
-    if discount_type == DiscountType.PERCENTAGE:
-        return base_price - (base_price * discount_value / Decimal(100))
-    return base_price - discount_value
-
 # ---------- shared api response (used by CREATE, GET, UPDATE) ----------
 # Helper function to format the training data for the frontend
+# (effective_price is computed by Postgres, see app/models/pricing/price.py)
 def training_response(training:Training)->TrainingResponse:
-        effective_price = calculate_effective_price(
-        training.base_price,
-        training.discount_value,
-        training.discount_type,
-    )
         return TrainingResponse(
         id=str(training.id),
         title=training.title,
         description=training.description,
         photo_url=training.photo_url,
         base_price=training.base_price,
-        effective_price=effective_price,
+        effective_price=training.effective_price,
         benefits=[b.text for b in training.benefits],  # read from DB, not request
         mentors=[
             MentorResponse(
@@ -55,6 +56,44 @@ def training_response(training:Training)->TrainingResponse:
         updated_at=training.updated_at,
     )
 
+# ---------- shared mentor linking (used by CREATE and UPDATE) ----------
+# Checks every mentor ID in one query and writes the links in one INSERT,
+# in the order they were sent (stored in TrainingMentor.order)
+def link_mentors(db: Session, training_id: UUID, mentor_ids: List[UUID]) -> None:
+    mentor_ids = list(dict.fromkeys(mentor_ids))  # drop duplicates, keep order
+    if not mentor_ids:
+        return
+
+    found = existing_ids(db, mentor=(Mentor, mentor_ids))["mentor"]
+    missing = [str(mentor_id) for mentor_id in mentor_ids if mentor_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Mentors do not exist: {', '.join(missing)}",
+        )
+
+    db.execute(
+        insert(TrainingMentor),
+        [
+            {"training_id": training_id, "mentor_id": mentor_id, "order": order}
+            for order, mentor_id in enumerate(mentor_ids)
+        ],
+    )
+
+# Loads a training with benefits and mentors in 3 queries (for the response)
+def load_training(db: Session, training_id: UUID) -> Training:
+    return (
+        db.query(Training)
+        .options(
+            selectinload(Training.benefits),
+            selectinload(Training.training_mentors)
+            .selectinload(TrainingMentor.mentor),
+        )
+        .filter(Training.id == training_id)
+        .populate_existing()
+        .one()
+    )
+
 # ==================  Crud operations ======================#
 # 1. Create a new training course
 @router.post("/", response_model=TrainingResponse)
@@ -85,81 +124,99 @@ def create_training(
         )
 
     # Step 3: Link the mentors to this training
-    for mentor_id in data.mentor_ids:
-        mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
-
-        if not mentor:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Mentor {mentor_id} does not exist",
-            )
-
-        db.add(
-            TrainingMentor(
-                training_id=training.id,
-                mentor_id=mentor.id,
-            )
-        )
+    link_mentors(db, training.id, data.mentor_ids)
 
     # ✅ commit ONCE
     db.commit()
+    invalidate_responses("trainings")
 
-    # ✅ refresh AFTER commit
-    db.refresh(training)
-
+    # ✅ reload AFTER commit, with benefits and mentors
     # ✅ ALWAYS return
-    return training_response(training)
+    return training_response(load_training(db, training.id))
 
 
 # ================== LIST TRAININGS ==================
 # 2. Get a list of all training courses (with pagination)
 @router.get("/", response_model=dict)
-def list_trainings(
+@cached_response("trainings")
+async def list_trainings(
+    request: Request,
     page: int = Query(1, ge=1),          # 1-based pagination
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None),   # next_cursor of the previous page, used instead of page
+    prices: PriceParams = Depends(),    # ?min_price= &max_price= &sort=price
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Step 1: Count the total number of training courses
-    total = db.query(Training).count()
+    # (same query gives the ETag, answer 304 if nothing changed)
+    filters = price_filters(Training, prices)
+    validators = await collection_validators(request, db, Training, *filters)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    total = validators.count
     # Step 2: Get the list of courses for the current page
-    trainings = (
-        db.query(Training).options(
+    # (with a cursor we continue after the previous page instead of skipping rows)
+    keyset_page = PageParams(limit=page_size, cursor=cursor, include_total=False)
+    sort_key, descending = price_order(prices)
+    query = keyset(
+        select(Training).options(
             selectinload(Training.benefits),          # load benefits
             selectinload(Training.training_mentors)   # load mentors join
             .selectinload(TrainingMentor.mentor)      # load mentor itself
-        )
-        .order_by(Training.created_at.desc())
-        .offset((page - 1)* page_size)
-        .limit(page_size)
-        .all()
+        ).where(*filters),
+        Training,
+        keyset_page,
+        sort_key,
+        descending,
     )
+    if cursor is None:
+        query = query.offset((page - 1)* page_size)
+    trainings, next_cursor = split_page((await db.scalars(query)).all(), keyset_page, sort_key)
     # build response
     items = [training_response(t) for t in trainings]
-    return {
+    return json_response(dict, {
         "items":items,
         "page": page,
         "page_size": page_size,
         "total": total,
-    }
+        "next_cursor": next_cursor,
+    }, validators)
 
     
 
 # 3. Get details of one specific training course
 @router.get("/{training_id}", response_model=TrainingResponse)
-def get_training_detail(training_id: UUID, db: Session =Depends(get_db)):
+async def get_training_detail(
+    training_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession =Depends(get_async_db),
+):
     # Step 1: Find the training course in the database
-    training = (
-        db.query(Training)
-        .options(
-            selectinload(Training.benefits),                # load benefits
-            selectinload(Training.training_mentors)
-            .selectinload(TrainingMentor.mentor),           # load mentors
-        )
-        .filter(Training.id == training_id).first()
-    )
+    training = await db.get(Training, training_id)
     if not training:
         raise HTTPException(status_code=404, detail="Training program not found")
+
+    # Step 2: Answer 304 if the client already has this version
+    validators = item_validators(request, training)
+    if is_not_modified(request, validators):
+        return not_modified(validators)
+    response.headers.update(validators.headers)
+
+    # Step 3: Load benefits and mentors
+    training = (
+        await db.scalars(
+            select(Training)
+            .options(
+                selectinload(Training.benefits),                # load benefits
+                selectinload(Training.training_mentors)
+                .selectinload(TrainingMentor.mentor),           # load mentors
+            )
+            .where(Training.id == training_id)
+            .execution_options(populate_existing=True)
+        )
+    ).one()
     return training_response(training)
 
 # ================== UPDATE TRAINING ==================
@@ -175,10 +232,7 @@ def update_training(
     # load training with relations
     training = (
         db.query(Training)
-        .options(
-            selectinload(Training.benefits),
-            selectinload(Training.training_mentors),
-        )
+        .options(selectinload(Training.benefits))
         .filter(Training.id == training_id)
         .first()
     )
@@ -195,6 +249,9 @@ def update_training(
         if field not in ["benefits", "mentor_ids"]:
             setattr(training, field, value)
 
+    # Always bump updated_at: benefit/mentor changes don't touch the row itself
+    training.updated_at = datetime.utcnow()
+
     # Step 2: Replace the benefits list
     if data.benefits is not None:
         training.benefits.clear() 
@@ -203,25 +260,18 @@ def update_training(
                 TrainingBenefit(text=benefit_text)
             )
     
-    # Step 3: Replace the mentors list
+    # Step 3: Replace the mentors list (one DELETE + one INSERT)
     if data.mentor_ids is not None:
-        training.training_mentors.clear() 
-
-        for mentor_id in data.mentor_ids:
-            mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
+        db.execute(
+            delete(TrainingMentor).where(TrainingMentor.training_id == training.id)
+        )
+        link_mentors(db, training.id, data.mentor_ids)
 
-            if not mentor:
-                raise HTTPException(400, f"Mentor {mentor_id} does not exist")
-        
-            
-            training.training_mentors.append(
-                TrainingMentor(mentor_id=mentor.id)
-            )
      # single commit = atomic update
     db.commit()
-    db.refresh(training)
+    invalidate_responses("trainings")
 
-    return training_response(training)
+    return training_response(load_training(db, training.id))
     
 
 # 5. Delete a training course
@@ -240,7 +290,39 @@ def delete_training(
     # Step 2: Delete the course and save changes
     db.delete(training)
     db.commit()
+    invalidate_responses("trainings")
 
     # 204 = success, no response body
     return
-    
+
+
+# 6. Set one discount on many trainings at once (seasonal promotions)
+@router.post("/reprice", response_model=RepriceResult)
+def reprice_trainings(
+    payload: TrainingRepriceRequest,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    # Step 1: Check the filter mentors in one query
+    found = existing_ids(db, mentor=(Mentor, payload.mentor_ids))["mentor"]
+    missing = [str(mentor_id) for mentor_id in payload.mentor_ids if mentor_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Mentors do not exist: {', '.join(missing)}",
+        )
+
+    # Step 2: Trainings taught by any of the mentors
+    filters = []
+    if payload.mentor_ids:
+        filters.append(Training.id.in_(
+            select(TrainingMentor.training_id).where(TrainingMentor.mentor_id.in_(payload.mentor_ids))
+        ))
+
+    # Step 3: Preview the new prices, save them unless it is a dry run
+    result = reprice(db, Training, payload, *filters)
+    if not payload.dry_run:
+        db.commit()
+        invalidate_responses("trainings")
+
+    return result
@@ -0,0 +1,21 @@
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    # Position of the item in the request array
+
+    ok: bool
+    id: Optional[UUID] = None
+    # ID of the created row when ok
+
+    error: Optional[str] = None
+    # Why the item was skipped when not ok
+
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
@@ -0,0 +1,56 @@
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field, model_validator
+from app.models.pricing.enums import DiscountType
+
+
+class RepriceRule(BaseModel):
+    discount_type: Optional[DiscountType] = None
+    discount_value: Optional[Decimal] = Field(None, ge=0)
+    # New discount for every matching row (both null = remove the discount)
+
+    dry_run: bool = True
+    # Only show the price changes; send false to save them
+
+    @model_validator(mode="after")
+    def validate_discount(self):
+        """
+        A discount needs both fields; percentages stay within 0-100.
+        """
+        if (self.discount_type is None) != (self.discount_value is None):
+            raise ValueError("discount_type and discount_value must be given together")
+        if self.discount_type == DiscountType.PERCENTAGE and self.discount_value > 100:
+            raise ValueError("A percentage discount cannot be above 100")
+        return self
+
+
+class ServiceRepriceRequest(RepriceRule):
+    tech_ids: List[UUID] = Field(default_factory=list)
+    offering_ids: List[UUID] = Field(default_factory=list)
+    # Only services using any of these techs / offerings (empty = no filter)
+
+
+class TrainingRepriceRequest(RepriceRule):
+    mentor_ids: List[UUID] = Field(default_factory=list)
+    # Only trainings taught by any of these mentors (empty = no filter)
+
+
+class RepriceItem(BaseModel):
+    id: UUID
+    title: str
+    base_price: Decimal
+    old_price: Decimal
+    new_price: Decimal
+
+
+class RepriceResult(BaseModel):
+    dry_run: bool
+    matched: int
+    # Rows the filters selected
+
+    changed: int
+    # Rows whose effective price changes
+
+    items: List[RepriceItem]
+    # One entry per matched row, sorted by title
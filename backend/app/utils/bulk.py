@@ -0,0 +1,73 @@
+# Shared helpers for the bulk import endpoints (POST .../bulk)
+# Items are checked up front, valid ones are written with multi-row INSERTs in
+# one transaction and every item gets its own result, so one bad row in an
+# import of thousands does not cost the whole batch.
+#
+# The endpoints take the body as list[dict] and validate each item here:
+# typed as list[XCreate], FastAPI would answer 422 for the whole batch.
+
+from uuid import UUID
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+from app.schemas.bulk import BulkItemResult, BulkResult
+
+
+def validate_items(schema: type[BaseModel], payload: list[dict]) -> tuple[list[tuple[int, BaseModel]], list[BulkItemResult]]:
+    """
+    Validate every item against the create schema on its own.
+    Returns (index, item) for the valid ones and a failed result for the others.
+    """
+    items, results = [], []
+    for index, raw in enumerate(payload):
+        try:
+            items.append((index, schema.model_validate(raw)))
+        except ValidationError as e:
+            results.append(failed(index, validation_message(e)))
+    return items, results
+
+
+def validation_message(error: ValidationError) -> str:
+    # e.g. "name: Field required; role: Input should be 'TEAM' or 'INTERN'"
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        if detail["loc"] else detail["msg"]
+        for detail in error.errors()
+    )
+
+
+def existing_ids(db: Session, **references) -> dict[str, set[UUID]]:
+    """
+    Check every referenced ID of a batch in ONE query.
+    Usage: existing_ids(db, tech=(ServiceTech, tech_ids), offering=(ServiceOffering, offering_ids))
+    Returns the IDs that exist, per reference name.
+    """
+    found: dict[str, set[UUID]] = {name: set() for name in references}
+    selects = [
+        select(model.id, literal(name).label("ref")).where(model.id.in_(ids))
+        for name, (model, ids) in references.items()
+        if ids
+    ]
+    if not selects:
+        return found
+
+    for row_id, name in db.execute(union_all(*selects)):
+        found[name].add(row_id)
+    return found
+
+
+def ok(index: int, row_id: UUID) -> BulkItemResult:
+    return BulkItemResult(index=index, ok=True, id=row_id)
+
+
+def failed(index: int, error: str) -> BulkItemResult:
+    return BulkItemResult(index=index, ok=False, error=error)
+
+
+def bulk_result(results: list[BulkItemResult]) -> BulkResult:
+    created = sum(1 for result in results if result.ok)
+    return BulkResult(
+        created=created,
+        failed=len(results) - created,
+        results=sorted(results, key=lambda result: result.index),  # request order
+    )
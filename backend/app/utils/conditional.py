@@ -0,0 +1,154 @@
+# Conditional GET support (ETag / Last-Modified) based on updated_at columns
+# Clients and the CDN send back the validators they got last time
+# (If-None-Match / If-Modified-Since). When nothing changed we answer 304
+# straight away, before loading relations or serializing anything.
+#
+# Every write handler bumps the parent row's updated_at when something shown in
+# its response changes (techs, feedbacks, mentors, ...), so updated_at of the
+# parent table is enough to describe an item, and count + max(updated_at)
+# is enough to describe a collection.
+#
+# Collections only get an ETag, never Last-Modified: a delete, or a hide /
+# reprice that moves rows out of the filter, changes the count but not
+# max(updated_at), so If-Modified-Since would answer a stale 304.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class Validators:
+    """
+    ETag + Last-Modified pair for one response.
+    """
+
+    def __init__(
+        self,
+        etag: str,
+        last_modified: datetime | None,
+        count: int | None = None,
+    ):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.count = count  # row count, for collections
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = http_date(self.last_modified)
+        return headers
+
+
+def http_date(value: datetime) -> str:
+    # updated_at is stored as naive UTC
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def make_validators(scope: str, *parts, last_modified: datetime | None) -> Validators:
+    # scope = path + normalized params, so each filter/page gets its own ETag
+    raw = "|".join([scope, *(str(part) for part in parts)])
+    etag = '"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+    return Validators(etag, last_modified)
+
+
+def normalized_params(kwargs: dict) -> tuple:
+    """
+    The endpoint arguments that describe the result (query values, PageParams,
+    PriceParams, ...), sorted by name, without the session/request objects.
+    cached_response keys on it and stores it in request.state, so the ETag of
+    a list has the same scope as its cache entry: ?a=1&b=2, ?b=2&a=1 and
+    ?a=1&b=2&c=<default> share both.
+    """
+    return tuple(
+        sorted(
+            (name, value)
+            for name, value in kwargs.items()
+            if not isinstance(value, (Session, AsyncSession, Request, Response))
+        )
+    )
+
+
+def request_scope(request: Request) -> str:
+    params = getattr(request.state, "normalized_params", None)
+    if params is None:
+        # endpoints without cached_response: at least ignore the param order
+        params = tuple(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{params!r}"
+
+
+def item_validators(request: Request, obj) -> Validators:
+    return make_validators(
+        request_scope(request),
+        obj.id,
+        obj.updated_at.isoformat(),
+        last_modified=obj.updated_at,
+    )
+
+
+async def collection_validators(
+    request: Request,
+    db: AsyncSession,
+    model,
+    *filters,
+) -> Validators:
+    # one cheap aggregate query: SELECT count(*), max(updated_at) ... WHERE filters
+    count, last_modified = (
+        await db.execute(
+            select(func.count(), func.max(model.updated_at)).where(*filters)
+        )
+    ).one()
+    validators = make_validators(
+        request_scope(request),
+        count,
+        last_modified.isoformat() if last_modified else "-",
+        last_modified=None,  # ETag only, see the top of this file
+    )
+    validators.count = count
+    return validators
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    # If-None-Match wins over If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or validators.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = validators.last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        return modified <= since
+
+    return False
+
+
+def not_modified(validators: Validators) -> Response:
+    return Response(status_code=304, headers=validators.headers)
+
+
+def json_response(
+    response_type,
+    value,
+    validators: Validators,
+    headers: dict | None = None,
+) -> JSONResponse:
+    # Serialize with the same schema FastAPI would use for response_model
+    adapter = TypeAdapter(response_type)
+    content = adapter.dump_python(
+        adapter.validate_python(value, from_attributes=True),
+        mode="json",
+    )
+    return JSONResponse(content, headers={**validators.headers, **(headers or {})})
@@ -0,0 +1,101 @@
+# Server-side image derivatives (thumbnails + modern formats)
+# The public site shows member, mentor, project and training photos as small
+# cards, so instead of pulling the full upload it can use a resized WebP/AVIF
+# copy. Encoding is CPU heavy, so it runs in a separate process pool and never
+# on the event loop or the request threadpool.
+
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps, features
+from app.config import IMAGE_MAX_PIXELS, IMAGE_WORKERS
+
+# format name -> (Pillow format, mime type, encoder options)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", "image/avif", {"quality": 60}),
+}
+
+
+def available_formats() -> list[str]:
+    # AVIF needs a Pillow build with libavif, skip it when missing
+    return [name for name in VARIANT_FORMATS if features.check(name)]
+
+
+class ImageTooManyPixels(Exception):
+    """Raised when an image has more than IMAGE_MAX_PIXELS pixels."""
+
+
+def check_pixel_count(image: Image.Image) -> None:
+    # image.size comes from the header, nothing has been decoded yet
+    width, height = image.size
+    if width * height > IMAGE_MAX_PIXELS:
+        raise ImageTooManyPixels(f"{width}x{height} is more than {IMAGE_MAX_PIXELS} pixels")
+
+
+def image_pixels_ok(data: bytes) -> bool:
+    # cheap check for the upload route: Image.open only parses the header
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            check_pixel_count(image)
+    except (ImageTooManyPixels, Image.DecompressionBombError):
+        return False  # the second one is Pillow's own (higher) limit
+    except Exception:
+        return True  # not a problem of size; render_variants reports it
+    return True
+
+
+def variant_names(widths: list[int], formats: list[str]) -> list[str]:
+    # e.g. "w320_webp", also used to build the storage file IDs
+    return [f"w{width}_{fmt}" for width in widths for fmt in formats]
+
+
+def render_variants(
+    data: bytes,
+    widths: list[int],
+    formats: list[str],
+) -> list[tuple[str, bytes, str]]:
+    """
+    Resize and re-encode one image. Runs inside a worker process.
+    Returns (variant name, encoded bytes, mime type) for every variant.
+    Images are never upscaled, so small uploads just get re-encoded.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        check_pixel_count(source)  # before anything is decoded
+        image = ImageOps.exif_transpose(source)  # respect camera rotation
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        variants = []
+        for width in widths:
+            resized = image.copy()
+            resized.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+            for fmt in formats:
+                pil_format, mime_type, options = VARIANT_FORMATS[fmt]
+                buffer = io.BytesIO()
+                resized.save(buffer, format=pil_format, **options)
+                variants.append((f"w{width}_{fmt}", buffer.getvalue(), mime_type))
+        return variants
+
+
+# ---------- shared process pool ----------
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # None lets Python use one worker per CPU core. forkserver: forking
+        # the running server would copy its threads, locks and DB connections
+        _pool = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKERS or None,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -1,6 +1,50 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
+from threading import Lock
+from cachetools import TLRUCache
 from jose import jwt
-from app.config import JWT_SECRET, JWT_ALGORITHM, TOKEN_EXPIRE_MINUTES
+from opentelemetry import trace
+from app.config import (
+    JWT_SECRET,
+    JWT_ALGORITHM,
+    TOKEN_EXPIRE_MINUTES,
+    TOKEN_CACHE_MAXSIZE,
+)
+from app.utils.tracing import tracer
+
+# ---------- verified token cache ----------
+# The dashboard sends the same bearer token on every request, so we remember
+# tokens whose signature was already checked. Keys are a SHA-256 of the token
+# (the raw token is never stored) and every entry expires exactly at the
+# token's own "exp", so a cached token can never outlive its validity.
+_verified_tokens: TLRUCache = TLRUCache(
+    maxsize=TOKEN_CACHE_MAXSIZE,
+    ttu=lambda _key, value, _now: value["exp"],  # expire at the token's exp
+    timer=time.time,  # "exp" is a unix timestamp
+)
+_lock = Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_cache_stats() -> dict:
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "size": len(_verified_tokens),
+            "maxsize": _verified_tokens.maxsize,
+            "hit_ratio": _stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def clear_token_cache() -> None:
+    with _lock:
+        _verified_tokens.clear()
 
 
 def create_access_token(payload: dict):
@@ -10,8 +54,20 @@ def create_access_token(payload: dict):
     return jwt.encode(data, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+@tracer.start_as_current_span("jwt.decode")
 def decode_access_token(token: str):
-    return jwt.decode(
+    key = _token_key(token)
+
+    # Step 1: Return the claims straight away if we verified this token before
+    with _lock:
+        claims = _verified_tokens.get(key)
+        _stats["hits" if claims is not None else "misses"] += 1
+    trace.get_current_span().set_attribute("jwt.cache_hit", claims is not None)
+    if claims is not None:
+        return dict(claims)  # copy so callers can't change the cached claims
+
+    # Step 2: Verify signature and expiry (raises JWTError on failure)
+    claims = jwt.decode(
         token, 
         JWT_SECRET,
         algorithms=[JWT_ALGORITHM],
@@ -20,3 +76,11 @@ def decode_access_token(token: str):
             "verify_exp":True,
         }
         )
+
+    # Step 3: Remember it until the token expires
+    # tokens without an exp claim are never cached
+    if isinstance(claims.get("exp"), (int, float)):
+        with _lock:
+            _verified_tokens[key] = dict(claims)
+
+    return claims
@@ -0,0 +1,224 @@
+# Prometheus metrics, served at GET /metrics (bearer METRICS_TOKEN, see app/routes/metrics.py)
+#
+# Multiple uvicorn/gunicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty
+# directory (wipe it before every start). Each worker then writes its values
+# to files there and /metrics, answered by any worker, adds them all up.
+#
+# Request metrics are recorded by MetricsMiddleware. Pool and cache numbers
+# live in per-process stats dicts, so each worker copies them into the
+# metrics below at most once per second (while serving requests), instead of
+# at scrape time where only the scraping worker would be seen.
+
+import os
+import time
+from anyio import to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.auth.cache import principal_cache_stats
+from app.db.session import pool_stats
+from app.utils.jwt import token_cache_stats
+from app.utils.response_cache import response_cache_stats
+from app.utils.security import password_pool_stats
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+SAMPLE_INTERVAL_SECONDS = 1.0
+
+# ---------- requests ----------
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency per route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# ---------- threadpool (sync endpoints and dependencies) ----------
+THREADPOOL_IN_USE = Gauge(
+    "threadpool_threads_in_use",
+    "AnyIO worker threads busy with sync endpoints",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_SIZE = Gauge(
+    "threadpool_threads_total",
+    "AnyIO worker thread limit",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_WAITING = Gauge(
+    "threadpool_tasks_waiting",
+    "Sync calls waiting for a free worker thread",
+    multiprocess_mode="livesum",
+)
+PASSWORD_POOL = Gauge(
+    "password_pool_jobs",
+    "bcrypt jobs in the password pool",
+    ["state"],  # queued / running
+    multiprocess_mode="livesum",
+)
+
+# ---------- database pools (engine: sync / async) ----------
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "SQLAlchemy pool connections",
+    ["engine", "state"],  # state: checked_out / checked_in / overflow
+    multiprocess_mode="livesum",
+)
+DB_POOL_EVENTS = Counter(
+    "db_pool_events",
+    "SQLAlchemy pool events",
+    ["engine", "event"],  # event: checkouts / connects / invalidations / timeouts
+)
+DB_POOL_WAIT = Counter(
+    "db_pool_wait_seconds",
+    "Total time spent waiting for a pooled connection",
+    ["engine"],
+)
+
+# ---------- caches ----------
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Cache lookups; hit ratio = hits / (hits + misses)",
+    ["cache", "result"],  # cache: response:<namespace> / principal / token
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries currently cached",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+
+# ---------- uploads ----------
+UPLOAD_BYTES = Counter(
+    "image_upload_bytes",
+    "Bytes sent to storage",
+    ["kind"],  # original / variant
+)
+UPLOADS = Counter(
+    "image_uploads",
+    "Files sent to storage",
+    ["kind"],
+)
+
+
+def record_upload(kind: str, size: int) -> None:
+    UPLOADS.labels(kind).inc()
+    UPLOAD_BYTES.labels(kind).inc(size)
+
+
+# ---------- sampling of the per-process stats ----------
+_last_sample = 0.0
+_last_totals: dict[tuple, float] = {}
+
+
+def _inc_to(counter, total: float, *labels: str) -> None:
+    # stats dicts hold running totals, counters want increments
+    key = (id(counter), labels)
+    previous = _last_totals.get(key, 0.0)
+    if total > previous:
+        (counter.labels(*labels) if labels else counter).inc(total - previous)
+    _last_totals[key] = total
+
+
+def sample_process_stats() -> None:
+    global _last_sample
+    now = time.monotonic()
+    if now - _last_sample < SAMPLE_INTERVAL_SECONDS:
+        return
+    _last_sample = now
+
+    limiter = to_thread.current_default_thread_limiter()
+    THREADPOOL_IN_USE.set(limiter.borrowed_tokens)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+    THREADPOOL_WAITING.set(limiter.statistics().tasks_waiting)
+
+    passwords = password_pool_stats()
+    PASSWORD_POOL.labels("queued").set(passwords["queued"])
+    PASSWORD_POOL.labels("running").set(passwords["running"])
+
+    for engine_name, pool in pool_stats().items():
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in pool:  # not available with NullPool (pgbouncer mode)
+                # QueuePool reports overflow < 0 while below pool_size
+                DB_POOL_CONNECTIONS.labels(engine_name, state).set(max(0, pool[state]))
+        for name in ("checkouts", "connects", "invalidations", "timeouts"):
+            _inc_to(DB_POOL_EVENTS, pool[name], engine_name, name)
+        _inc_to(DB_POOL_WAIT, pool["wait_time_total_ms"] / 1000, engine_name)
+
+    caches = {"principal": principal_cache_stats(), "token": token_cache_stats()}
+    responses = response_cache_stats()
+    for namespace, counters in responses["namespaces"].items():
+        caches[f"response:{namespace}"] = counters
+    CACHE_ENTRIES.labels("response").set(responses["size"])
+    CACHE_ENTRIES.labels("principal").set(caches["principal"]["size"])
+    CACHE_ENTRIES.labels("token").set(caches["token"]["size"])
+    for cache, counters in caches.items():
+        for result in ("hits", "misses"):
+            _inc_to(CACHE_LOOKUPS, counters[result], cache, result)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: latency per route template (not raw path, so
+    /admin/services/{service_id} is one series) and in-flight requests.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method,
+                getattr(route, "path", "<unmatched>"),  # unknown paths share one series
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+            sample_process_stats()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        # fresh registry per scrape, reading every worker's files
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        sample_process_stats()
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_stopped() -> None:
+    # drop this worker's live gauges from the shared directory
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,114 @@
+# Keyset (cursor) pagination on (created_at, id)
+# Offset pagination makes Postgres read and throw away every skipped row, so
+# page 500 costs 500x page 1. Keyset pagination remembers the last row of the
+# page instead and continues with
+#   WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC
+# which is one index seek on the (created_at, id) indexes, whatever the depth.
+#
+# Pagination is opt-in so the existing frontend keeps getting plain arrays:
+#   ?limit=20                     -> first page
+#   ?limit=20&cursor=<X-Next-Cursor> -> next page
+#   &include_total=true           -> X-Total-Count header
+# The body stays a list, the next cursor is sent in X-Next-Cursor and Link.
+#
+# Lists sorted by another column (e.g. effective_price, mentor name) pass
+# sort_key and descending to keyset/split_page; the cursor then holds that
+# column's value.
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from uuid import UUID
+from fastapi import HTTPException, Query, Request
+from sqlalchemy import tuple_
+
+MAX_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)  # frozen = hashable, so it can be part of a cache key
+class PageParams:
+    """
+    Query params shared by every cursor-paginated list endpoint.
+    """
+
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = Query(None, description="Opaque X-Next-Cursor value")
+    include_total: bool = Query(False)
+
+
+def encode_cursor(value: datetime | Decimal | str, row_id: UUID) -> str:
+    text = value.isoformat() if isinstance(value, datetime) else str(value)
+    raw = f"{text}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, value_type: type = datetime) -> tuple[datetime | Decimal | str, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = (
+            # split at the last "|": text values (names) may contain one
+            base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        )
+        if value_type is datetime:
+            return datetime.fromisoformat(value), UUID(row_id)
+        return value_type(value), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidOperation):
+        # also a cursor from the same list with another ?sort=
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset(query, model, page: PageParams, sort_key: str = "created_at", descending: bool = True):
+    """
+    Add the stable order, the cursor condition and the limit to a select()
+    or db.query(). Fetches one extra row to know if there is a next page.
+    """
+    column = getattr(model, sort_key)
+    if descending:
+        query = query.order_by(column.desc(), model.id.desc())
+    else:
+        query = query.order_by(column.asc(), model.id.asc())
+
+    if page.cursor:
+        value, row_id = decode_cursor(page.cursor, column.type.python_type)
+        # row-value comparison, matches the (sort column, id) index order
+        position = tuple_(column, model.id)
+        query = query.filter(
+            position < tuple_(value, row_id) if descending else position > tuple_(value, row_id)
+        )
+
+    if page.limit is not None:
+        query = query.limit(page.limit + 1)
+
+    return query
+
+
+def split_page(rows, page: PageParams, sort_key: str = "created_at") -> tuple[list, str | None]:
+    # Drop the extra row and build the cursor for the next page from the last one
+    rows = list(rows)
+    if page.limit is None or len(rows) <= page.limit:
+        return rows, None
+
+    rows = rows[: page.limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_key), last.id)
+
+
+def page_headers(
+    request: Request,
+    page: PageParams,
+    next_cursor: str | None,
+    total: int | None = None,
+) -> dict:
+    headers = {}
+
+    if next_cursor:
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    if page.include_total and total is not None:
+        headers["X-Total-Count"] = str(total)
+
+    return headers
@@ -0,0 +1,38 @@
+# Price filter and sort params shared by the service and training lists.
+# Both filter and sort use the stored effective_price column and its
+# (effective_price, id) index, so they work in SQL together with pagination:
+#   ?min_price=100&max_price=500&sort=price&limit=20
+
+from dataclasses import dataclass
+from decimal import Decimal
+from fastapi import Query
+from app.models.pricing.enums import CatalogSort
+
+
+@dataclass(frozen=True)  # frozen = hashable, so it can be part of a cache key
+class PriceParams:
+    """
+    Query params for lists of priced items (services, trainings).
+    """
+
+    min_price: Decimal | None = Query(None, ge=0, description="Lowest effective price")
+    max_price: Decimal | None = Query(None, ge=0, description="Highest effective price")
+    sort: CatalogSort = Query(CatalogSort.NEWEST)
+
+
+def price_filters(model, prices: PriceParams) -> list:
+    filters = []
+    if prices.min_price is not None:
+        filters.append(model.effective_price >= prices.min_price)
+    if prices.max_price is not None:
+        filters.append(model.effective_price <= prices.max_price)
+    return filters
+
+
+def price_order(prices: PriceParams) -> tuple[str, bool]:
+    # (sort_key, descending) for keyset() / split_page()
+    if prices.sort == CatalogSort.PRICE:
+        return "effective_price", False
+    if prices.sort == CatalogSort.PRICE_DESC:
+        return "effective_price", True
+    return "created_at", True
@@ -0,0 +1,130 @@
+# Per-request SQL stats: how many statements an endpoint runs, how long they
+# take together and which one was the slowest. Chatty endpoints (per-row
+# queries in a loop) stand out immediately in the logs or response headers.
+#
+# Headers (QUERY_STATS_HEADERS=true):
+#   X-DB-Query-Count: 3
+#   X-DB-Time-Ms: 4.21
+#   Server-Timing: db;dur=4.21;desc="3 queries"   (shown by browser devtools)
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import (
+    QUERY_STATS_ENABLED,
+    QUERY_STATS_HEADERS,
+    QUERY_STATS_WARN_DB_MS,
+    QUERY_STATS_WARN_QUERIES,
+)
+from app.db.session import QueryStats, async_engine, current_query_stats, engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware) so the stats context is set
+    in the same task the endpoint runs in.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if QUERY_STATS_HEADERS:
+                    # queries made after this point (streaming, background
+                    # tasks) only show up in the log line
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Time-Ms"] = f"{stats.total_ms:.2f}"
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"',
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            _log_request(scope, status_code, stats, started)
+
+
+def _log_request(scope: Scope, status_code: int, stats: QueryStats, started: float) -> None:
+    slow = (
+        stats.count > QUERY_STATS_WARN_QUERIES
+        or stats.total_ms > QUERY_STATS_WARN_DB_MS
+    )
+    level = logging.WARNING if slow else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+
+    route = scope.get("route")
+    logger.log(level, json.dumps({
+        "event": "request_db_stats",
+        "method": scope["method"],
+        "route": getattr(route, "path", scope["path"]),  # template, e.g. /admin/services/{service_id}
+        "status": status_code,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "db_queries": stats.count,
+        "db_time_ms": round(stats.total_ms, 2),
+        "slowest_query_ms": round(stats.slowest_ms, 2),
+        "slowest_query": stats.slowest_sql,
+    }))
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements: list[str] = []
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """
+    Test helper: fail when the block runs more than max_queries SQL statements.
+
+        def test_list_services_is_not_n_plus_one(client):
+            with query_budget(3):
+                client.get("/admin/services/")
+
+    Listens on both engines directly (not on the request context), so it
+    works with TestClient, which runs the app in another thread.
+    """
+    counter = QueryCounter()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter.count += 1
+        counter.statements.append(statement)
+
+    targets = (engine, async_engine.sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", count)
+    try:
+        yield counter
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", count)
+
+    if counter.count > max_queries:
+        statements = "\n".join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {counter.count}:\n{statements}"
+        )
@@ -0,0 +1,70 @@
+# Shared "is this row still used somewhere?" check for the delete endpoints
+# of master data (techs, offerings, mentors). One query answers it for every
+# referencing table at once, with the titles of the rows that block the
+# delete, instead of loading the join rows and lazy-loading each parent.
+# A blocked delete answers 409 Conflict with the blocking rows (count, ids,
+# titles) next to the usual "detail" message.
+
+from uuid import UUID
+from fastapi import status
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+
+def dependent_references(db: Session, target_id: UUID, **references) -> dict[str, dict]:
+    """
+    Rows that still reference target_id, per reference name:
+    {"services": {"count": 2, "ids": [...], "titles": [...]}}, sorted by title.
+    Usage:
+        dependent_references(
+            db,
+            tech_id,
+            services=(ServiceTechMap.tech_id, Service.title),
+            projects=(ProjectTechMap.tech_id, Project.title),
+        )
+    Each reference is (join table column pointing at the target, title column
+    of the parent row). Names with no references are left out, so an empty
+    dict means the row is safe to delete.
+    """
+    # Step 1: One COUNT + sorted id/title lists per join table, all in one UNION ALL
+    selects = [
+        select(
+            literal(name).label("name"),
+            func.count().label("count"),
+            func.array_agg(
+                aggregate_order_by(title_column.class_.id, title_column, title_column.class_.id)
+            ).label("ids"),
+            func.array_agg(
+                aggregate_order_by(title_column, title_column, title_column.class_.id)
+            ).label("titles"),
+        )
+        .select_from(title_column.class_)
+        .join(link_column.class_)  # join condition comes from the foreign key
+        .where(link_column == target_id)
+        for name, (link_column, title_column) in references.items()
+    ]
+
+    # Step 2: Keep only the tables that still point at the row
+    return {
+        name: {"count": count, "ids": [str(row_id) for row_id in ids], "titles": titles}
+        for name, count, ids, titles in db.execute(union_all(*selects))
+        if count
+    }
+
+
+def describe_references(dependents: dict[str, dict]) -> str:
+    # {"services": {"titles": ["A", "B"], ...}} -> "2 service(s): A, B"
+    return "; ".join(
+        f"{found['count']} {name.rstrip('s')}(s): {', '.join(found['titles'])}"
+        for name, found in dependents.items()
+    )
+
+
+def references_conflict(detail: str, dependents: dict[str, dict]) -> JSONResponse:
+    # "detail" stays a plain message for clients that only show that
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": detail, "references": dependents},
+    )
@@ -0,0 +1,72 @@
+# Shared bulk repricing for services and trainings (POST .../reprice)
+# A seasonal promotion sets the same discount on every row matching some
+# filters. Instead of one PATCH per row:
+#   1. one SELECT loads the matching rows, the new prices are computed for
+#      all of them in one pass with the canonical pricing rule (the preview)
+#   2. one UPDATE ... WHERE id IN (<those rows>) writes the discount to all
+#      of them; Postgres recomputes the generated effective_price column per
+#      row and RETURNING hands back the prices it stored
+# When applying, the SELECT is FOR UPDATE: the rows stay locked until the
+# caller commits, so a PATCH in between cannot change a base price after it
+# was read, and the result lists exactly the rows that were updated.
+
+from datetime import datetime
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.pricing.price import effective_price
+from app.schemas.pricing import RepriceItem, RepriceResult, RepriceRule
+
+
+def reprice(db: Session, model, rule: RepriceRule, *filters) -> RepriceResult:
+    """
+    Preview (rule.dry_run) or apply rule to every row of model (Service or
+    Training) matching filters. The caller commits and invalidates caches.
+    """
+    # Step 1: Load only the columns the preview needs, for all rows at once
+    # (and lock them when applying, see the top of this file)
+    query = (
+        select(model.id, model.title, model.base_price, model.effective_price)
+        .where(*filters)
+        .order_by(model.title, model.id)
+    )
+    if not rule.dry_run:
+        query = query.with_for_update(of=model)
+    rows = db.execute(query).all()
+
+    # Step 2: New price of every row, same rule as the generated column
+    items = [
+        RepriceItem(
+            id=row.id,
+            title=row.title,
+            base_price=row.base_price,
+            old_price=row.effective_price,
+            new_price=effective_price(row.base_price, rule.discount_type, rule.discount_value),
+        )
+        for row in rows
+    ]
+
+    # Step 3: One set-based UPDATE for exactly the locked rows; report the
+    # prices Postgres stored, not our own computation
+    if not rule.dry_run and items:
+        stored = dict(
+            db.execute(
+                update(model)
+                .where(model.id.in_([item.id for item in items]))
+                .values(
+                    discount_type=rule.discount_type,
+                    discount_value=rule.discount_value,
+                    updated_at=datetime.utcnow(),  # new ETag / Last-Modified
+                )
+                .returning(model.id, model.effective_price)
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+        for item in items:
+            item.new_price = stored[item.id]
+
+    return RepriceResult(
+        dry_run=rule.dry_run,
+        matched=len(items),
+        changed=sum(1 for item in items if item.new_price != item.old_price),
+        items=items,
+    )
@@ -0,0 +1,122 @@
+# In-process response cache for the public catalog endpoints
+# The public site reads services, projects, trainings, opportunities and
+# members on every page view, but admins only change them a few times a day.
+# So list endpoints keep their last result per (endpoint, query params) and the
+# create/update/delete handlers of the same domain drop it right after commit.
+
+import functools
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from cachetools import TTLCache
+from fastapi import Request, Response
+from app.config import RESPONSE_CACHE_MAXSIZE, RESPONSE_CACHE_TTL_SECONDS
+from app.utils.conditional import Validators, is_not_modified, normalized_params, not_modified
+
+# TTL is only a safety net (e.g. other worker processes), writes invalidate
+_responses: TTLCache = TTLCache(
+    maxsize=RESPONSE_CACHE_MAXSIZE,
+    ttl=RESPONSE_CACHE_TTL_SECONDS,
+)
+_lock = Lock()
+_stats: dict[str, dict[str, int]] = {}
+# bumped by every invalidation, so a result computed before a write
+# (but finished after it) is not stored over the fresh state
+_generations: dict[str, int] = {}
+
+
+def _count(namespace: str, field: str) -> None:
+    counters = _stats.setdefault(
+        namespace, {"hits": 0, "misses": 0, "invalidations": 0}
+    )
+    counters[field] += 1
+
+
+def cached_response(namespace: str):
+    """
+    Cache the result of an async list endpoint under a namespace
+    (e.g. "services"). Query params are part of the key, the DB session is not.
+    When the endpoint returns a Response with an ETag, a cached hit answers
+    conditional requests with 304 without touching the DB.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)  # keeps the signature FastAPI reads params from
+        async def wrapper(*args, **kwargs):
+            params = normalized_params(kwargs)
+            key = (namespace, func.__name__, params)
+            request = next(
+                (value for value in kwargs.values() if isinstance(value, Request)),
+                None,
+            )
+            if request is not None:
+                # the endpoint's ETag uses the same params (request_scope)
+                request.state.normalized_params = params
+
+            with _lock:
+                cached = _responses.get(key)
+                _count(namespace, "hits" if cached is not None else "misses")
+                generation = _generations.get(namespace, 0)
+
+            if cached is not None:
+                if (
+                    isinstance(cached, Response)
+                    and "etag" in cached.headers
+                    and request is not None
+                ):
+                    validators = Validators(
+                        cached.headers["etag"],
+                        cached_last_modified(cached),
+                    )
+                    if is_not_modified(request, validators):
+                        return not_modified(validators)
+                return cached
+
+            result = await func(*args, **kwargs)
+
+            # never cache 304s or errors, only full responses, and only if no
+            # write invalidated the namespace while the query was running
+            if not isinstance(result, Response) or result.status_code == 200:
+                with _lock:
+                    if _generations.get(namespace, 0) == generation:
+                        _responses[key] = result
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def cached_last_modified(response: Response):
+    # parsed back from the header of a cached response
+    value = response.headers.get("last-modified")
+    return parsedate_to_datetime(value).replace(tzinfo=None) if value else None
+
+
+def invalidate_responses(*namespaces: str) -> None:
+    # Call after db.commit() in every handler that changes the domain
+    with _lock:
+        for key in [key for key in _responses if key[0] in namespaces]:
+            _responses.pop(key, None)
+        for namespace in namespaces:
+            _generations[namespace] = _generations.get(namespace, 0) + 1
+            _count(namespace, "invalidations")
+
+
+def response_cache_stats() -> dict:
+    with _lock:
+        namespaces = {}
+        for namespace, counters in _stats.items():
+            lookups = counters["hits"] + counters["misses"]
+            namespaces[namespace] = {
+                **counters,
+                "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+            }
+        hits = sum(c["hits"] for c in _stats.values())
+        lookups = hits + sum(c["misses"] for c in _stats.values())
+        return {
+            "size": len(_responses),
+            "maxsize": _responses.maxsize,
+            "ttl_seconds": _responses.ttl,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "namespaces": namespaces,
+        }
@@ -2,9 +2,83 @@
 # we are using passlib to hash and verify passwords
 # it will take plain password and hashed password as input and return True if they match else False
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from passlib.context import CryptContext
+from app.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+from app.utils.tracing import tracer
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def hash_password(plain_password):
+    return pwd_context.hash(plain_password)
+
+
+# ---------- dedicated bcrypt worker pool ----------
+# bcrypt is slow on purpose (~100-300ms). Running it in FastAPI's shared
+# threadpool lets a burst of logins starve every other sync endpoint, so it
+# gets its own small pool. bcrypt releases the GIL, so threads are enough.
+class PasswordPoolBusy(Exception):
+    """Raised when too many password checks are already waiting."""
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+_lock = Lock()
+_stats = {"queued": 0, "running": 0, "completed": 0, "rejected": 0}
+
+
+def _run_tracked(func, *args):
+    # moves one job from "queued" to "running" while it executes
+    with _lock:
+        _stats["queued"] -= 1
+        _stats["running"] += 1
+    try:
+        return func(*args)
+    finally:
+        with _lock:
+            _stats["running"] -= 1
+            _stats["completed"] += 1
+
+
+async def _submit(func, *args):
+    with _lock:
+        if _stats["queued"] >= PASSWORD_HASH_MAX_QUEUE:
+            _stats["rejected"] += 1
+            raise PasswordPoolBusy()
+        _stats["queued"] += 1
+
+    future = _executor.submit(_run_tracked, func, *args)
+    future.add_done_callback(_release_if_cancelled)
+    # cancelling the await (client gone, timeout) cancels a job that has not
+    # started yet, then _run_tracked never runs to take it off "queued"
+    return await asyncio.wrap_future(future)
+
+
+def _release_if_cancelled(future) -> None:
+    if future.cancelled():
+        with _lock:
+            _stats["queued"] -= 1
+
+
+# spans include the time spent waiting for a free worker
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    with tracer.start_as_current_span("bcrypt.verify"):
+        return await _submit(verify_password, plain_password, hashed_password)
+
+
+def password_pool_stats() -> dict:
+    with _lock:
+        return {
+            **_stats,
+            "max_workers": PASSWORD_HASH_WORKERS,
+            "max_queue": PASSWORD_HASH_MAX_QUEUE,
+        }
@@ -0,0 +1,112 @@
+# Long-lived Appwrite storage client
+# The Appwrite SDK opens a brand new HTTPS connection for every call and is
+# synchronous, which blocks the event loop inside async routes. Instead we keep
+# one httpx.AsyncClient per worker process (created at app startup) so TLS
+# sessions and connections are reused, and uploads are awaited, not blocking.
+
+import httpx
+from app.config import (
+    APPWRITE_API_KEY,
+    APPWRITE_BUCKET_ID,
+    APPWRITE_ENDPOINT,
+    APPWRITE_PROJECT_ID,
+    APPWRITE_MAX_CONNECTIONS,
+    APPWRITE_TIMEOUT_SECONDS,
+)
+from app.utils.tracing import tracer
+
+
+class AppwriteStorage:
+    """
+    Minimal async client for the Appwrite Storage REST API.
+    Only the calls the backend needs (uploading a file) are implemented.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        project_id: str,
+        api_key: str,
+        bucket_id: str,
+        transport: httpx.AsyncBaseTransport | None = None,  # tests pass a MockTransport
+    ):
+        self.endpoint = endpoint.rstrip("/")
+        self.project_id = project_id
+        self.bucket_id = bucket_id
+        self._client = httpx.AsyncClient(
+            base_url=self.endpoint,
+            headers={
+                "x-appwrite-project": project_id,
+                "x-appwrite-key": api_key,
+            },
+            timeout=APPWRITE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=APPWRITE_MAX_CONNECTIONS,
+                max_keepalive_connections=APPWRITE_MAX_CONNECTIONS,
+            ),
+            transport=transport,
+        )
+
+    async def create_file(
+        self,
+        data: bytes,
+        filename: str,
+        mime_type: str,
+        file_id: str = "unique()",
+    ) -> dict:
+        # "unique()" asks Appwrite to generate the file ID (same as ID.unique())
+        with tracer.start_as_current_span(
+            "appwrite.create_file",
+            attributes={
+                "appwrite.bucket_id": self.bucket_id,
+                "file.size": len(data),
+                "file.mime_type": mime_type,
+            },
+        ) as span:
+            response = await self._client.post(
+                f"/storage/buckets/{self.bucket_id}/files",
+                data={"fileId": file_id},
+                files={"file": (filename or "upload", data, mime_type)},
+            )
+            span.set_attribute("http.status_code", response.status_code)
+            response.raise_for_status()
+            return response.json()
+
+    def file_view_url(self, file_id: str) -> str:
+        return (
+            f"{self.endpoint}/storage/buckets/"
+            f"{self.bucket_id}/files/{file_id}/view"
+            f"?project={self.project_id}"
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# One shared client per process, opened and closed by the app lifespan
+_storage: AppwriteStorage | None = None
+
+
+async def start_storage() -> None:
+    global _storage
+    if _storage is None:
+        _storage = AppwriteStorage(
+            APPWRITE_ENDPOINT,
+            APPWRITE_PROJECT_ID,
+            APPWRITE_API_KEY,
+            APPWRITE_BUCKET_ID,
+        )
+
+
+async def stop_storage() -> None:
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
+
+
+def get_storage() -> AppwriteStorage:
+    # FastAPI dependency, override it in tests to point at a stand-in server
+    if _storage is None:
+        raise RuntimeError("Storage client is not started")
+    return _storage
@@ -0,0 +1,97 @@
+# Opt-in OpenTelemetry tracing (TRACING_ENABLED=true)
+# Spans: every HTTP request (FastAPI instrumentation), every SQL statement
+# (engine events, both engines), JWT decode, bcrypt verify/hash and Appwrite
+# uploads. Spans go to an OTLP/gRPC collector, configured with the standard
+# OTEL_EXPORTER_OTLP_ENDPOINT variable (default http://localhost:4317).
+#
+# When tracing is disabled no provider is installed, so `tracer` hands out
+# no-op spans and the SQL hooks are not registered at all.
+
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from app.config import (
+    TRACING_ENABLED,
+    TRACING_SAMPLE_RATIO,
+    TRACING_SERVICE_NAME,
+    TRACING_SQL_STATEMENTS,
+)
+
+# Used by the app code for its own spans (proxy: picks up the provider later)
+tracer = trace.get_tracer("app")
+
+_provider = None
+
+
+def setup_tracing(app) -> None:
+    global _provider
+    if not TRACING_ENABLED or _provider is not None:
+        return
+
+    # Exporter/SDK imports are heavy, only pay for them when tracing is on
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    # Step 1: Sample a share of new traces, always follow the caller's decision
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(_provider)
+
+    # Step 2: One server span per request (health checks are skipped)
+    FastAPIInstrumentor.instrument_app(
+        app,
+        tracer_provider=_provider,
+        excluded_urls="/health/.*,/metrics",
+    )
+
+    # Step 3: One client span per SQL statement
+    _instrument_engines()
+
+
+def shutdown_tracing() -> None:
+    # flush the spans still waiting in the batch processor
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def _instrument_engines() -> None:
+    from sqlalchemy import event
+    from app.db.session import async_engine, engine
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _start_sql_span)
+        event.listen(target, "after_cursor_execute", _end_sql_span)
+        event.listen(target, "handle_error", _fail_sql_span)
+
+
+def _start_sql_span(conn, cursor, statement, parameters, context, executemany):
+    operation = statement.split(None, 1)[0].upper() if statement else "SQL"
+    attributes = {"db.system": "postgresql", "db.operation": operation}
+    if TRACING_SQL_STATEMENTS:
+        attributes["db.statement"] = statement  # SQL text only, never parameters
+    context._otel_span = tracer.start_span(
+        operation,
+        kind=SpanKind.CLIENT,
+        attributes=attributes,
+    )
+
+
+def _end_sql_span(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_otel_span", None)
+    if span is not None:
+        span.end()
+
+
+def _fail_sql_span(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, "_otel_span", None) if context is not None else None
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
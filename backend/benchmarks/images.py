@@ -0,0 +1,109 @@
+"""
+Image variant encoding benchmark: how fast render_variants turns one upload
+into its resized WebP/AVIF copies, per format, in this process and through
+the shared image process pool.
+
+    cd backend
+    python -m benchmarks.images --sizes 1200x800,3000x2000 --images 20
+
+"serial" is one render_variants call at a time in this process (latency of a
+single upload). "pool" submits --images uploads at once to get_image_pool()
+(IMAGE_WORKERS processes), which is the throughput a worker can sustain.
+No database or storage is used.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.run import configure_environment
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1200x800,3000x2000", help="comma separated source sizes (WIDTHxHEIGHT)")
+    parser.add_argument("--images", type=int, default=20, help="uploads per size and format")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def make_photo(width: int, height: int) -> bytes:
+    # gradients plus noise: compresses roughly like a photo, unlike flat colour
+    from PIL import Image
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def run(args) -> list[dict]:
+    from app.config import IMAGE_VARIANT_WIDTHS, IMAGE_WORKERS
+    from app.utils.images import available_formats, get_image_pool, render_variants, shutdown_image_pool
+
+    pool = get_image_pool()
+    workers = IMAGE_WORKERS or os.cpu_count()  # what get_image_pool() uses
+    results = []
+    try:
+        for size in args.sizes.split(","):
+            width, height = (int(value) for value in size.split("x"))
+            data = make_photo(width, height)
+            for fmt in available_formats():
+                render_variants(data, IMAGE_VARIANT_WIDTHS, [fmt])  # warm up (codec init)
+                pool.submit(render_variants, data, IMAGE_VARIANT_WIDTHS, [fmt]).result()
+
+                # Step 1: One upload at a time, in this process
+                latencies = []
+                for _ in range(args.images):
+                    start = time.perf_counter()
+                    variants = render_variants(data, IMAGE_VARIANT_WIDTHS, [fmt])
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+                # Step 2: All uploads at once through the process pool
+                start = time.perf_counter()
+                futures = [pool.submit(render_variants, data, IMAGE_VARIANT_WIDTHS, [fmt]) for _ in range(args.images)]
+                for future in futures:
+                    future.result()
+                pool_seconds = time.perf_counter() - start
+
+                results.append({
+                    "source": size,
+                    "source_kb": round(len(data) / 1000),
+                    "format": fmt,
+                    "variants_kb": round(sum(len(variant) for _, variant, _ in variants) / 1000),
+                    "serial_ms_per_image": round(statistics.median(latencies), 1),
+                    "pool_images_per_s": round(args.images / pool_seconds, 2),
+                    "pool_workers": workers,
+                })
+                case = results[-1]
+                print(
+                    f"{size:>10} {case['source_kb']:8} {fmt:>6} {case['variants_kb']:8} "
+                    f"{case['serial_ms_per_image']:9.1f} {case['pool_images_per_s']:10.2f}"
+                )
+    finally:
+        shutdown_image_pool()
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # no database is used, but app.config needs a (local) URL
+    configure_environment(os.getenv("BENCH_DATABASE_URL", "postgresql://postgres@localhost/postgres"))
+
+    print("    source  src KB format  out KB  serial ms  pool img/s")
+    results = run(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
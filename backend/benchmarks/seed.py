@@ -0,0 +1,296 @@
+# Seeds a benchmark database with realistic volumes of every model.
+# Rows are written with multi-row INSERTs, so seeding a few thousand rows takes
+# seconds. Every table is truncated first: only ever point this at a
+# throwaway local database (run.py refuses non-local hosts).
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.models import (
+    AdminUser,
+    InternshipDetail,
+    JobDetail,
+    Member,
+    Mentor,
+    Opportunity,
+    OpportunityRequirement,
+    Project,
+    ProjectFeedback,
+    ProjectTechMap,
+    Service,
+    ServiceOffering,
+    ServiceOfferingMap,
+    ServiceTech,
+    ServiceTechMap,
+    Training,
+    TrainingBenefit,
+    TrainingMentor,
+)
+from app.models.member.enums import MemberRole
+from app.models.opportunities.enums import OpportunityType
+from app.models.pricing.enums import DiscountType
+from app.utils.security import hash_password
+
+# Rows per table at --scale 1 (children are per parent row)
+VOLUMES = {
+    "techs": 40,
+    "offerings": 15,
+    "services": 200,
+    "projects": 200,
+    "feedbacks_per_project": 5,
+    "opportunities": 500,
+    "requirements_per_opportunity": 6,
+    "members": 300,
+    "mentors": 60,
+    "trainings": 200,
+    "benefits_per_training": 5,
+}
+
+TABLES = [
+    "admin_users",
+    "service_tech_map",
+    "service_offering_map",
+    "services",
+    "service_techs",
+    "service_offerings",
+    "project_tech_map",
+    "project_feedbacks",
+    "projects",
+    "opportunity_requirements",
+    "job_details",
+    "internship_details",
+    "opportunities",
+    "members",
+    "training_benefits",
+    "training_mentors",
+    "trainings",
+    "mentors",
+]
+
+WORDS = (
+    "python react fastapi postgres design cloud data mobile web devops "
+    "security testing analytics marketing seo frontend backend api ml ai"
+).split()
+
+# Every seeded timestamp is relative to this, so the same --scale and seed
+# give byte-identical rows (and cursors / ETags) on every run
+REFERENCE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+ADMIN_EMAIL = "bench@example.com"
+ADMIN_PASSWORD = "bench-password"
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _uuid(rng: random.Random) -> UUID:
+    # from the seeded generator, so ids (and cursors) repeat across runs too
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _created(rng: random.Random) -> datetime:
+    # spread over two years so keyset pages and sorting have real work to do
+    return REFERENCE_TIME - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+
+
+def _price(rng: random.Random) -> dict:
+    discount_type = rng.choice([None, DiscountType.PERCENTAGE, DiscountType.AMOUNT])
+    return {
+        "base_price": Decimal(rng.randint(50, 2000)),
+        "discount_type": discount_type,
+        "discount_value": Decimal(rng.randint(5, 40)) if discount_type else None,
+    }
+
+
+def seed(db: Session, scale: float = 1.0, seed_value: int = 42) -> dict[str, int]:
+    """
+    Truncate every table and insert scale x VOLUMES rows.
+    Returns the number of rows written per table.
+    """
+    rng = random.Random(seed_value)  # same data on every run
+    volume = {name: max(1, int(count * scale)) for name, count in VOLUMES.items()}
+    rows: dict[str, list[dict]] = {}
+
+    db.execute(text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+
+    rows["admin_users"] = [{
+        "email": ADMIN_EMAIL,
+        "hashed_password": hash_password(ADMIN_PASSWORD),
+        "is_active": True,
+        "role": "admin",
+    }]
+
+    # Master data
+    rows["techs"] = [{"id": _uuid(rng), "name": f"Tech {i}"} for i in range(volume["techs"])]
+    rows["offerings"] = [{"id": _uuid(rng), "name": f"Offering {i}"} for i in range(volume["offerings"])]
+    tech_ids = [row["id"] for row in rows["techs"]]
+    offering_ids = [row["id"] for row in rows["offerings"]]
+
+    # Services
+    rows["services"], rows["service_techs"], rows["service_offerings"] = [], [], []
+    for _ in range(volume["services"]):
+        service_id = _uuid(rng)
+        created = _created(rng)
+        rows["services"].append({
+            "id": service_id,
+            "title": _text(rng, 3),
+            "description": _text(rng, 30),
+            "photo_url": f"https://example.com/{service_id}.webp",
+            **_price(rng),
+            "created_at": created,
+            "updated_at": created,
+        })
+        rows["service_techs"] += [
+            {"service_id": service_id, "tech_id": tech_id}
+            for tech_id in rng.sample(tech_ids, min(5, len(tech_ids)))
+        ]
+        rows["service_offerings"] += [
+            {"service_id": service_id, "offering_id": offering_id}
+            for offering_id in rng.sample(offering_ids, min(3, len(offering_ids)))
+        ]
+
+    # Projects + feedbacks
+    rows["projects"], rows["project_techs"], rows["feedbacks"] = [], [], []
+    for _ in range(volume["projects"]):
+        project_id = _uuid(rng)
+        created = _created(rng)
+        rows["projects"].append({
+            "id": project_id,
+            "title": _text(rng, 3),
+            "description": _text(rng, 40),
+            "project_link": f"https://example.com/p/{project_id}",
+            "created_at": created,
+            "updated_at": created,
+        })
+        rows["project_techs"] += [
+            {"project_id": project_id, "tech_id": tech_id}
+            for tech_id in rng.sample(tech_ids, min(4, len(tech_ids)))
+        ]
+        rows["feedbacks"] += [
+            {
+                "id": _uuid(rng),
+                "project_id": project_id,
+                "client_name": _text(rng, 2),
+                "feedback_description": _text(rng, 20),
+                "rating": rng.randint(1, 5),
+                "created_at": _created(rng),
+            }
+            for _ in range(volume["feedbacks_per_project"])
+        ]
+
+    # Opportunities + details + requirements
+    rows["opportunities"], rows["jobs"], rows["internships"], rows["requirements"] = [], [], [], []
+    for _ in range(volume["opportunities"]):
+        opportunity_id = _uuid(rng)
+        created = _created(rng)
+        kind = rng.choice(list(OpportunityType))
+        rows["opportunities"].append({
+            "id": opportunity_id,
+            "title": f"{_text(rng, 2)} {'Engineer' if kind == OpportunityType.JOB else 'Intern'}",
+            "description": _text(rng, 60),
+            "location": rng.choice(["Kathmandu", "Lalitpur", "Pokhara", "Remote"]),
+            "type": kind,
+            "created_at": created,
+            "updated_at": created,
+        })
+        if kind == OpportunityType.JOB:
+            rows["jobs"].append({
+                "opportunity_id": opportunity_id,
+                "employment_type": rng.choice(["Full-time", "Part-time", "Contract"]),
+                "salary_range": "Competitive",
+            })
+        else:
+            rows["internships"].append({
+                "opportunity_id": opportunity_id,
+                "duration_months": rng.choice([3, 6]),
+                "stipend": "10k/month",
+            })
+        rows["requirements"] += [
+            {"id": _uuid(rng), "opportunity_id": opportunity_id, "text": _text(rng, 6), "order": order}
+            for order in range(volume["requirements_per_opportunity"])
+        ]
+
+    # Members
+    rows["members"] = []
+    for _ in range(volume["members"]):
+        created = _created(rng)
+        rows["members"].append({
+            "id": _uuid(rng),
+            "name": _text(rng, 2),
+            "position": _text(rng, 2),
+            "start_date": date(2024, 1, 1) + timedelta(days=rng.randint(0, 600)),
+            "social_media": {"linkedin": "https://linkedin.com/in/example"},
+            "contact_email": "member@example.com",
+            "is_visible": rng.random() < 0.8,
+            "role": rng.choice(list(MemberRole)),
+            "created_at": created,
+            "updated_at": created,
+        })
+
+    # Mentors + trainings
+    rows["mentors"] = []
+    for _ in range(volume["mentors"]):
+        created = _created(rng)
+        rows["mentors"].append({
+            "id": _uuid(rng),
+            "name": _text(rng, 2),
+            "specialization": rng.choice(WORDS),
+            "created_at": created,
+            "updated_at": created,
+        })
+    mentor_ids = [row["id"] for row in rows["mentors"]]
+
+    rows["trainings"], rows["benefits"], rows["training_mentors"] = [], [], []
+    for _ in range(volume["trainings"]):
+        training_id = _uuid(rng)
+        created = _created(rng)
+        rows["trainings"].append({
+            "id": training_id,
+            "title": _text(rng, 3),
+            "description": _text(rng, 40),
+            **_price(rng),
+            "created_at": created,
+            "updated_at": created,
+        })
+        rows["benefits"] += [
+            {"id": _uuid(rng), "training_id": training_id, "text": _text(rng, 5), "order": order}
+            for order in range(volume["benefits_per_training"])
+        ]
+        rows["training_mentors"] += [
+            {"training_id": training_id, "mentor_id": mentor_id, "order": order}
+            for order, mentor_id in enumerate(rng.sample(mentor_ids, min(2, len(mentor_ids))))
+        ]
+
+    # Parents before children (FKs)
+    for model, name in [
+        (AdminUser, "admin_users"),
+        (ServiceTech, "techs"),
+        (ServiceOffering, "offerings"),
+        (Service, "services"),
+        (ServiceTechMap, "service_techs"),
+        (ServiceOfferingMap, "service_offerings"),
+        (Project, "projects"),
+        (ProjectTechMap, "project_techs"),
+        (ProjectFeedback, "feedbacks"),
+        (Opportunity, "opportunities"),
+        (JobDetail, "jobs"),
+        (InternshipDetail, "internships"),
+        (OpportunityRequirement, "requirements"),
+        (Member, "members"),
+        (Mentor, "mentors"),
+        (Training, "trainings"),
+        (TrainingBenefit, "benefits"),
+        (TrainingMentor, "training_mentors"),
+    ]:
+        if rows[name]:
+            db.execute(insert(model), rows[name])
+
+    db.commit()
+    db.execute(text("ANALYZE"))  # fresh planner stats, like a long-running DB
+    db.commit()
+    return {name: len(table_rows) for name, table_rows in rows.items()}
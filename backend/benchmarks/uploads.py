@@ -0,0 +1,161 @@
+"""
+Upload memory benchmark: peak Python memory (tracemalloc) and max RSS growth
+of this process while N uploads hit POST /admin/uploads/image at once.
+
+    cd backend
+    python -m benchmarks.uploads --concurrency 1,10,50
+
+Cases per concurrency level:
+  valid       a ~900KB JPEG, stored and turned into variants
+  too large   a 20MB body with Content-Length (rejected from the header)
+  streamed    a 20MB chunked body without Content-Length (rejected once
+              ~1MB was read)
+
+Peak memory should grow by about 1MB per concurrent valid upload and stay
+flat for the rejected ones. Storage is an in-memory stand-in (no Appwrite
+calls) and auth is overridden, so no database is needed. Variants are
+encoded in the image process pool, whose memory is not counted here.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+from benchmarks.run import configure_environment
+
+TOO_LARGE = 20_000_000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,10,50", help="comma separated numbers of parallel uploads")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def make_jpeg(target_size: int = 900_000) -> bytes:
+    # random pixels barely compress, so the size is easy to steer
+    from PIL import Image
+
+    rng = random.Random(42)
+    side = 800
+    image = Image.frombytes("RGB", (side, side), rng.randbytes(side * side * 3))
+    for quality in (95, 90, 80, 70, 60, 50):
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality)
+        if buffer.tell() <= target_size:
+            return buffer.getvalue()
+    return buffer.getvalue()
+
+
+class MemoryStorage:
+    """Stand-in for AppwriteStorage that only counts what it receives."""
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+
+    async def create_file(self, data: bytes, filename: str, mime_type: str, file_id: str = "unique()") -> dict:
+        self.files += 1
+        self.bytes += len(data)
+        return {"$id": file_id}
+
+    def file_view_url(self, file_id: str) -> str:
+        return f"http://storage/{file_id}"
+
+
+def multipart(payload: bytes) -> tuple[bytes, str]:
+    boundary = "benchmarkboundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="photo.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+async def run(args) -> list[dict]:
+    import httpx
+
+    from app.auth.deps import get_current_user
+    from app.main import app
+    from app.models import AdminUser
+    from app.utils.storage import get_storage
+
+    storage = MemoryStorage()
+    app.dependency_overrides[get_storage] = lambda: storage
+    app.dependency_overrides[get_current_user] = lambda: AdminUser(id=1, email="bench@example.com", role="admin", is_active=True)
+
+    valid_body, content_type = multipart(make_jpeg())
+    large_body, _ = multipart(b"\xff\xd8\xff" + bytes(TOO_LARGE))
+
+    async def chunked(body: bytes):
+        # no Content-Length: the server only sees the size while reading
+        for start in range(0, len(body), 65_536):
+            yield body[start:start + 65_536]
+
+    cases = [
+        ("valid", lambda: valid_body, 200),
+        ("too large", lambda: large_body, 413),
+        ("streamed", lambda: chunked(large_body), 413),
+    ]
+
+    results = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        async def upload(content):
+            return await client.post("/admin/uploads/image", content=content, headers={"Content-Type": content_type})
+
+        await upload(valid_body)  # warm up (starts the image pool)
+        for concurrency in [int(level) for level in args.concurrency.split(",")]:
+            for name, content, expected in cases:
+                rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                tracemalloc.start()
+                start = time.perf_counter()
+                responses = await asyncio.gather(*(upload(content()) for _ in range(concurrency)))
+                elapsed = (time.perf_counter() - start) * 1000
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                assert all(response.status_code == expected for response in responses), responses[0].text
+
+                results.append({
+                    "case": name,
+                    "concurrency": concurrency,
+                    "peak_mb": round(peak / 1_000_000, 1),
+                    "peak_mb_per_upload": round(peak / 1_000_000 / concurrency, 2),
+                    "max_rss_growth_mb": round((rss_after - rss_before) / 1024, 1),  # ru_maxrss is in KB
+                    "ms": round(elapsed, 1),
+                })
+                case = results[-1]
+                print(
+                    f"{concurrency:11} {case['peak_mb']:8.1f} {case['peak_mb_per_upload']:9.2f} "
+                    f"{case['max_rss_growth_mb']:10.1f} {case['ms']:9.1f}  {name}"
+                )
+
+    app.dependency_overrides.clear()
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # no database is used, but app.config needs a (local) URL
+    configure_environment(os.getenv("BENCH_DATABASE_URL", "postgresql://postgres@localhost/postgres"))
+
+    print("concurrency  peak MB  MB/upload  RSS +MB        ms  case")
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
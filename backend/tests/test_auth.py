@@ -0,0 +1,23 @@
+# The principal cache must never let a deactivated admin write
+
+from sqlalchemy import text
+
+from app.auth.deps import get_current_user
+from app.main import app
+from app.models import AdminUser
+from app.utils.jwt import create_access_token
+
+
+def test_write_rechecks_admin_deactivated_outside_the_app(client, db):
+    app.dependency_overrides.pop(get_current_user)  # real token check
+    db.add(AdminUser(email="deactivated@example.com", hashed_password="-", is_active=True, role="admin"))
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'deactivated@example.com', 'role': 'admin'})}"}
+    assert client.get("/health/cache", headers=headers).status_code == 200  # now cached
+
+    # deactivated with SQL: no ORM hook fires, the cached principal stays
+    db.execute(text("UPDATE admin_users SET is_active = false WHERE email = 'deactivated@example.com'"))
+    db.commit()
+
+    response = client.post("/admin/service-techs", json={"name": "React"}, headers=headers)
+    assert response.status_code == 403
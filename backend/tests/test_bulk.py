@@ -0,0 +1,56 @@
+# Bulk imports: one invalid item fails on its own, the rest is still created
+
+from uuid import uuid4
+
+from sqlalchemy import func, select
+
+from app.models import Member, Opportunity, Project
+
+
+def post_bulk(client, url: str, items: list) -> dict:
+    response = client.post(url, json=items)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_bulk_members_reports_invalid_items(client, db):
+    result = post_bulk(client, "/admin/members/bulk", [
+        {"name": "Ana", "role": "TEAM"},
+        {"role": "INTERN"},  # no name
+        {"name": "Bo", "role": "BOSS"},
+        {"name": "Cy", "role": "INTERN"},
+    ])
+
+    assert (result["created"], result["failed"]) == (2, 2)
+    assert [item["index"] for item in result["results"]] == [0, 1, 2, 3]
+    assert [item["ok"] for item in result["results"]] == [True, False, False, True]
+    assert result["results"][1]["error"] == "name: Field required"
+    assert result["results"][2]["error"].startswith("role: ")
+
+    members = db.scalars(select(Member).order_by(Member.name)).all()
+    assert [member.name for member in members] == ["Ana", "Cy"]
+    assert all(member.created_at and member.updated_at for member in members)
+
+
+def test_bulk_opportunities_reports_model_level_errors(client, db):
+    result = post_bulk(client, "/api/admin/opportunities/bulk", [
+        {"title": "Dev", "type": "JOB", "job_details": {}, "requirements": ["python"]},
+        {"title": "Intern", "type": "INTERNSHIP", "requirements": []},  # no details
+    ])
+
+    assert (result["created"], result["failed"]) == (1, 1)
+    assert "internship_details is required" in result["results"][1]["error"]
+    assert db.scalar(select(func.count()).select_from(Opportunity)) == 1
+
+
+def test_bulk_projects_mixes_schema_and_reference_errors(client, db):
+    result = post_bulk(client, "/admin/projects/bulk", [
+        {"title": "Site", "tech_ids": []},
+        {"title": "Shop", "tech_ids": ["not-a-uuid"]},
+        {"title": "App", "tech_ids": [str(uuid4())]},  # unknown tech
+    ])
+
+    assert (result["created"], result["failed"]) == (1, 2)
+    assert result["results"][1]["error"].startswith("tech_ids.0: ")
+    assert result["results"][2]["error"] == "One or more tech IDs are invalid"
+    assert db.scalar(select(func.count()).select_from(Project)) == 1
@@ -0,0 +1,65 @@
+# Image variants: pixel limit (decompression bombs) and encoding
+
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.auth.deps import get_current_user
+from app.config import IMAGE_MAX_PIXELS
+from app.main import app
+from app.models import AdminUser
+from app.utils.images import ImageTooManyPixels, image_pixels_ok, render_variants
+from app.utils.storage import get_storage
+
+
+def png(width: int, height: int) -> bytes:
+    # one flat colour: a few KB on disk however large the image is
+    buffer = io.BytesIO()
+    Image.new("L", (width, height)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+TOO_MANY_PIXELS = (IMAGE_MAX_PIXELS // 1000 + 1, 1000)
+
+
+def test_render_variants_resizes_and_never_upscales():
+    variants = render_variants(png(800, 400), [320, 1280], ["webp"])
+
+    assert [name for name, _, _ in variants] == ["w320_webp", "w1280_webp"]
+    sizes = [Image.open(io.BytesIO(data)).size for _, data, _ in variants]
+    assert sizes == [(320, 160), (800, 400)]
+
+
+def test_render_variants_rejects_too_many_pixels():
+    with pytest.raises(ImageTooManyPixels):
+        render_variants(png(*TOO_MANY_PIXELS), [320], ["webp"])
+
+
+def test_image_pixels_ok():
+    assert image_pixels_ok(png(100, 100))
+    assert not image_pixels_ok(png(*TOO_MANY_PIXELS))
+    assert image_pixels_ok(b"not an image")  # not a size problem
+
+
+def test_upload_route_rejects_too_many_pixels_before_storing():
+    class Storage:
+        async def create_file(self, *args, **kwargs):
+            raise AssertionError("must not be stored")
+
+    app.dependency_overrides[get_storage] = Storage
+    app.dependency_overrides[get_current_user] = lambda: AdminUser(
+        id=1, email="admin@example.com", role="admin", is_active=True
+    )
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/admin/uploads/image",
+                files={"file": ("bomb.png", png(*TOO_MANY_PIXELS), "image/png")},
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image dimensions too large"
@@ -0,0 +1,61 @@
+# Mentor pages must follow the same order as the full list: (name, id)
+
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+
+from app.models.training.mentor import Mentor
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_pages_follow_the_full_list_order(client, db):
+    # inserted out of name order; two share a name, one contains the cursor separator
+    names = ["zoe", "anna", "mia", "anna", "b|c", "kim"]
+    db.execute(insert(Mentor), [{"name": name} for name in names])
+    db.commit()
+
+    full = [mentor["id"] for mentor in client.get("/admin/mentors/").json()]
+
+    paged, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/admin/mentors/", params=params)
+        assert response.status_code == 200, response.text
+        paged += [mentor["id"] for mentor in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert paged == full
+    assert [mentor["name"] for mentor in client.get("/admin/mentors/").json()] == sorted(names)
+
+
+def test_duplicate_names_are_ordered_by_id(client, db):
+    ids = [uuid4() for _ in range(4)]
+    db.execute(insert(Mentor), [{"id": mentor_id, "name": "anna"} for mentor_id in ids])
+    db.execute(insert(Mentor), [{"name": "zoe"}])
+    db.commit()
+
+    listed = client.get("/admin/mentors/").json()
+    assert [mentor["id"] for mentor in listed[:4]] == sorted(str(mentor_id) for mentor_id in ids)
+    assert listed[4]["name"] == "zoe"
+
+
+def test_cursor_round_trip():
+    row_id = uuid4()
+    for name in ("anna", "b|c", "a|b|c", ""):
+        assert decode_cursor(encode_cursor(name, row_id), str) == (name, row_id)
+
+
+def test_next_page_starts_after_the_cursor_row(client, db):
+    db.execute(insert(Mentor), [{"name": name} for name in ["anna", "anna", "anna", "b|c"]])
+    db.commit()
+
+    first = client.get("/admin/mentors/", params={"limit": 2})
+    last = first.json()[-1]
+    # the cursor names the last row of the page: (name, id)
+    assert decode_cursor(first.headers["x-next-cursor"], str) == (last["name"], UUID(last["id"]))
+
+    second = client.get("/admin/mentors/", params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+    full = client.get("/admin/mentors/").json()
+    assert first.json() + second.json() == full
@@ -0,0 +1,34 @@
+# GET /metrics is only served to a scraper that sends METRICS_TOKEN
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import metrics
+
+
+@pytest.fixture
+def scrape(monkeypatch):
+    def get(token: str, header: str | None = None):
+        monkeypatch.setattr(metrics, "METRICS_TOKEN", token)
+        headers = {"Authorization": header} if header else {}
+        with TestClient(app) as client:
+            return client.get("/metrics", headers=headers)
+
+    return get
+
+
+def test_metrics_are_off_without_a_token(scrape):
+    assert scrape("").status_code == 404
+    assert scrape("", "Bearer anything").status_code == 404
+
+
+def test_metrics_need_the_token(scrape):
+    assert scrape("s3cret").status_code == 401
+    assert scrape("s3cret", "Bearer wrong").status_code == 401
+
+
+def test_metrics_with_the_token(scrape):
+    response = scrape("s3cret", "Bearer s3cret")
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.text
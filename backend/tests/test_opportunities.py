@@ -0,0 +1,58 @@
+# Opportunity search vector: kept in sync with the requirements, and
+# refreshed once per statement (not once per requirement row)
+
+from uuid import uuid4
+
+from sqlalchemy import insert, text
+
+from app.models import Opportunity
+
+URL = "/api/admin/opportunities"
+
+
+def ranked_titles(client, search: str) -> list[str]:
+    response = client.get(URL, params={"search": search, "search_mode": "ranked"})
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()]
+
+
+def test_search_follows_requirement_changes(client, db):
+    created = client.post(URL, json={
+        "title": "Backend developer",
+        "type": "JOB",
+        "job_details": {},
+        "requirements": ["Kubernetes experience", "Rust"],
+    })
+    assert created.status_code == 201, created.text
+    opportunity_id = created.json()["id"]
+    assert ranked_titles(client, "kubernetes") == ["Backend developer"]
+
+    # the update route deletes and re-inserts every requirement
+    updated = client.patch(f"{URL}/{opportunity_id}", json={"requirements": ["Terraform"]})
+    assert updated.status_code == 200, updated.text
+    assert ranked_titles(client, "kubernetes") == []
+    assert ranked_titles(client, "terraform") == ["Backend developer"]
+
+
+def test_requirement_writes_rewrite_the_opportunity_once(db):
+    opportunity_id = uuid4()
+    db.execute(insert(Opportunity), [{"id": opportunity_id, "title": "Intern", "type": "INTERNSHIP"}])
+    db.commit()
+
+    def opportunity_updates() -> int:
+        # pending (not yet flushed) counters of this backend, so compare deltas
+        return db.execute(text(
+            "SELECT n_tup_upd FROM pg_stat_xact_user_tables WHERE relname = 'opportunities'"
+        )).scalar() or 0
+
+    before = opportunity_updates()
+    # one statement, 50 rows (the row trigger rewrote the opportunity 50 times)
+    db.execute(text(
+        'INSERT INTO opportunity_requirements (id, opportunity_id, text, "order") '
+        "SELECT gen_random_uuid(), :id, 'skill' || i, i FROM generate_series(1, 50) AS i"
+    ), {"id": opportunity_id})
+    assert opportunity_updates() - before == 1
+
+    db.execute(text("DELETE FROM opportunity_requirements WHERE opportunity_id = :id"), {"id": opportunity_id})
+    assert opportunity_updates() - before == 2
+    db.commit()
@@ -0,0 +1,52 @@
+# SQL statements per list request: fixed budgets, whatever the data volume.
+# An N+1 loop (one query per row) blows the budget and fails with the
+# statements listed. Volumes come from benchmarks.seed (scale 0.2 = 40
+# services, 40 projects, 100 opportunities with 6 requirements each).
+
+import pytest
+
+from app.utils.query_stats import query_budget
+from app.utils.response_cache import invalidate_responses
+from benchmarks.seed import seed
+
+# (url, max queries): validators (1) + rows (1) + one IN query per relation
+LIST_BUDGETS = [
+    ("/admin/services/", 4),  # techs, offerings
+    ("/admin/services/?limit=20", 4),
+    ("/admin/services/?sort=price&limit=20", 4),
+    ("/admin/projects/", 4),  # techs, feedbacks
+    ("/admin/projects/?limit=20", 4),
+    ("/api/admin/opportunities", 5),  # requirements, job and internship details
+    ("/api/admin/opportunities?limit=20", 5),
+    ("/api/admin/opportunities?type=JOB&search=python", 5),
+]
+
+
+@pytest.mark.parametrize("url,budget", LIST_BUDGETS)
+def test_list_stays_within_query_budget(client, db, url, budget):
+    seed(db, scale=0.2)
+    invalidate_responses("services", "projects", "opportunities")  # seeded behind the API's back
+
+    with query_budget(budget):
+        response = client.get(url)
+    assert response.status_code == 200, response.text
+    assert response.json()
+
+    # the second request is answered from the response cache
+    with query_budget(0):
+        assert client.get(url).status_code == 200
+
+
+def test_full_project_list_budget_past_500_rows(client, db):
+    # selectinload split the ids into IN queries of 500 (6 queries here)
+    from benchmarks.projects import seed_projects
+
+    seed_projects(db, 1200)
+    invalidate_responses("projects")
+
+    with query_budget(4):
+        response = client.get("/admin/projects/")
+    assert response.status_code == 200, response.text
+    projects = response.json()
+    assert len(projects) == 1200
+    assert all(len(project["techs"]) == 4 and len(project["feedbacks"]) == 5 for project in projects)
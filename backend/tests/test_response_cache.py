@@ -0,0 +1,40 @@
+# The response cache must never keep a result that a write already replaced
+
+import asyncio
+
+from app.utils.response_cache import cached_response, invalidate_responses
+
+
+def test_result_finished_after_an_invalidation_is_not_stored():
+    calls = []
+
+    @cached_response("race")
+    async def list_items(page: int = 1):
+        calls.append(page)
+        if len(calls) == 1:
+            # a write commits and invalidates while this (old) read is running
+            invalidate_responses("race")
+            return "stale"
+        return "fresh"
+
+    async def scenario():
+        return [await list_items(page=1) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == ["stale", "fresh", "fresh"]
+    assert len(calls) == 2  # the stale result was not cached, the fresh one was
+
+
+def test_invalidation_drops_cached_results():
+    calls = []
+
+    @cached_response("drop")
+    async def list_items():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        first = await list_items()
+        invalidate_responses("drop")
+        return first, await list_items(), await list_items()
+
+    assert asyncio.run(scenario()) == (1, 2, 2)
@@ -0,0 +1,35 @@
+# bcrypt pool: a cancelled login must not keep its queue slot
+
+import asyncio
+import threading
+
+from app.config import PASSWORD_HASH_WORKERS
+from app.utils import security
+
+
+def test_cancelled_queued_job_frees_its_slot():
+    release = threading.Event()
+
+    async def scenario():
+        # Step 1: keep every worker busy so the next job has to wait
+        busy = [
+            asyncio.create_task(security._submit(release.wait))
+            for _ in range(PASSWORD_HASH_WORKERS)
+        ]
+        while security.password_pool_stats()["running"] < PASSWORD_HASH_WORKERS:
+            await asyncio.sleep(0.01)
+
+        # Step 2: queue one more and cancel it before it starts
+        queued = asyncio.create_task(security._submit(security.hash_password, "secret"))
+        await asyncio.sleep(0.01)
+        assert security.password_pool_stats()["queued"] == 1
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+
+        release.set()
+        await asyncio.gather(*busy)
+
+    asyncio.run(scenario())
+
+    stats = security.password_pool_stats()
+    assert (stats["queued"], stats["running"]) == (0, 0)
@@ -0,0 +1,243 @@
+# Service endpoints: query counts (no N+1), delete guards and pricing
+
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, select
+
+from app.models import Service, ServiceOffering, ServiceOfferingMap, ServiceTech, ServiceTechMap
+from app.utils.query_stats import query_budget
+from app.utils.response_cache import invalidate_responses
+
+
+def add_services(db, count: int, links: int) -> tuple[list[str], list[str]]:
+    # count services, each linked to `links` techs and `links` offerings
+    # names are unique columns, so every call gets fresh ones
+    techs = [{"id": uuid4(), "name": f"tech {uuid4()}"} for _ in range(links)]
+    offerings = [{"id": uuid4(), "name": f"offering {uuid4()}"} for _ in range(links)]
+    services = [
+        {"id": uuid4(), "title": f"service {i}", "base_price": 100}
+        for i in range(count)
+    ]
+    db.execute(insert(ServiceTech), techs)
+    db.execute(insert(ServiceOffering), offerings)
+    db.execute(insert(Service), services)
+    if links:
+        db.execute(insert(ServiceTechMap), [
+            {"service_id": service["id"], "tech_id": tech["id"]}
+            for service in services for tech in techs
+        ])
+        db.execute(insert(ServiceOfferingMap), [
+            {"service_id": service["id"], "offering_id": offering["id"]}
+            for service in services for offering in offerings
+        ])
+    db.commit()
+    invalidate_responses("services")  # rows were written behind the API's back
+    return [str(service["id"]) for service in services], [str(tech["id"]) for tech in techs]
+
+
+def count_queries(client, method: str, url: str, **kwargs) -> int:
+    with query_budget(10) as counter:
+        response = client.request(method, url, **kwargs)
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+def test_list_services_query_count_is_constant(client, db):
+    add_services(db, 1, 1)
+    one = count_queries(client, "GET", "/admin/services/")
+
+    add_services(db, 50, 5)
+    many = count_queries(client, "GET", "/admin/services/")
+
+    assert len(client.get("/admin/services/").json()) == 51
+    assert many == one
+
+
+def test_get_service_query_count_is_constant(client, db):
+    (few,), _ = add_services(db, 1, 1)
+    (lots,), _ = add_services(db, 1, 20)
+
+    assert count_queries(client, "GET", f"/admin/services/{lots}") == count_queries(
+        client, "GET", f"/admin/services/{few}"
+    )
+
+
+def test_update_service_query_count_is_constant(client, db):
+    (few,), few_techs = add_services(db, 1, 1)
+    (lots,), lots_techs = add_services(db, 1, 20)
+
+    one = count_queries(client, "PATCH", f"/admin/services/{few}", json={"title": "a", "tech_ids": few_techs})
+    many = count_queries(client, "PATCH", f"/admin/services/{lots}", json={"title": "b", "tech_ids": lots_techs})
+
+    assert many == one
+    assert len(client.get(f"/admin/services/{lots}").json()["techs"]) == 20
+
+
+def test_list_services_ignores_if_modified_since_after_a_delete(client, db):
+    (first, _), _ = add_services(db, 2, 1)
+    listed = client.get("/admin/services/")
+    assert "last-modified" not in listed.headers  # collections: ETag only
+
+    # deleting does not move max(updated_at), only the count
+    assert client.delete(f"/admin/services/{first}").status_code in (200, 204)
+    response = client.get(
+        "/admin/services/",
+        headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    etag = response.headers["etag"]
+    assert etag != listed.headers["etag"]
+    assert client.get("/admin/services/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_delete_tech_still_in_use_answers_409_with_references(client, db):
+    (service_id,), (tech_id,) = add_services(db, 1, 1)
+
+    response = client.delete(f"/admin/service-techs/{tech_id}")
+    assert response.status_code == 409
+    assert response.json()["references"] == {
+        "services": {"count": 1, "ids": [service_id], "titles": ["service 0"]},
+    }
+    assert "1 service(s): service 0" in response.json()["detail"]
+
+    db.execute(delete(ServiceTechMap).where(ServiceTechMap.tech_id == tech_id))
+    db.commit()
+    assert client.delete(f"/admin/service-techs/{tech_id}").status_code == 204
+
+
+def test_delete_offering_still_in_use_answers_409_with_references(client, db):
+    service_ids, _ = add_services(db, 2, 1)
+    offering_id = db.scalars(
+        select(ServiceOfferingMap.offering_id).where(ServiceOfferingMap.service_id == service_ids[0])
+    ).one()
+
+    response = client.delete(f"/admin/service-offerings/{offering_id}")
+    assert response.status_code == 409
+    references = response.json()["references"]["services"]
+    assert references["count"] == 2
+    assert references["titles"] == ["service 0", "service 1"]
+    assert references["ids"] == service_ids
+
+    db.execute(delete(ServiceOfferingMap).where(ServiceOfferingMap.offering_id == offering_id))
+    db.commit()
+    assert client.delete(f"/admin/service-offerings/{offering_id}").status_code == 204
+
+
+def service_prices(db) -> dict:
+    db.expire_all()
+    return {
+        str(service_id): (price, updated_at)
+        for service_id, price, updated_at in db.execute(
+            select(Service.id, Service.effective_price, Service.updated_at)
+        )
+    }
+
+
+def test_reprice_dry_run_changes_nothing(client, db):
+    add_services(db, 3, 1)
+    before = service_prices(db)
+
+    response = client.post("/admin/services/reprice", json={
+        "discount_type": "PERCENTAGE", "discount_value": 25, "dry_run": True,
+    })
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["dry_run"], result["matched"], result["changed"]) == (True, 3, 3)
+    assert {item["new_price"] for item in result["items"]} == {"75.00"}
+    assert service_prices(db) == before
+
+
+def test_reprice_apply_updates_price_and_updated_at(client, db):
+    service_ids, tech_ids = add_services(db, 2, 1)
+    add_services(db, 1, 1)  # other tech: not matched
+    before = service_prices(db)
+
+    response = client.post("/admin/services/reprice", json={
+        "discount_type": "AMOUNT", "discount_value": 30, "dry_run": False, "tech_ids": tech_ids,
+    })
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["dry_run"], result["matched"], result["changed"]) == (False, 2, 2)
+    assert sorted(item["id"] for item in result["items"]) == sorted(service_ids)
+
+    after = service_prices(db)
+    for service_id, (price, updated_at) in after.items():
+        if service_id in service_ids:
+            assert price == Decimal("70.00")
+            assert updated_at > before[service_id][1]
+        else:
+            assert (price, updated_at) == before[service_id]
+    assert {item["new_price"] for item in result["items"]} == {"70.00"}
+
+
+def add_priced_services(db, prices: list[int]) -> None:
+    db.execute(insert(Service), [
+        {"id": uuid4(), "title": f"priced {i}", "base_price": price}
+        for i, price in enumerate(prices)
+    ])
+    db.commit()
+    invalidate_responses("services")
+
+
+def all_pages(client, params: dict) -> list[dict]:
+    rows, cursor = [], None
+    while True:
+        response = client.get("/admin/services/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        rows += response.json()
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return rows
+
+
+def test_price_filter_bounds_are_inclusive(client, db):
+    add_priced_services(db, [50, 100, 150, 200, 250])
+
+    response = client.get("/admin/services/", params={"min_price": 100, "max_price": 200, "sort": "price"})
+    assert [service["effective_price"] for service in response.json()] == ["100.00", "150.00", "200.00"]
+    assert client.get("/admin/services/", params={"min_price": 251}).json() == []
+
+
+def test_price_sort_asc_and_desc(client, db):
+    add_priced_services(db, [300, 100, 200])
+
+    ascending = client.get("/admin/services/", params={"sort": "price"}).json()
+    descending = client.get("/admin/services/", params={"sort": "price_desc"}).json()
+    assert [service["effective_price"] for service in ascending] == ["100.00", "200.00", "300.00"]
+    assert descending == ascending[::-1]
+
+
+def test_price_pages_neither_skip_nor_repeat_duplicate_prices(client, db):
+    # most rows share a price, so only the id keeps the keyset order stable
+    add_priced_services(db, [100, 200, 200, 200, 200, 200, 300, 200, 100])
+
+    for sort in ("price", "price_desc"):
+        full = client.get("/admin/services/", params={"sort": sort}).json()
+        paged = all_pages(client, {"sort": sort, "limit": 2})
+        assert [service["id"] for service in paged] == [service["id"] for service in full]
+        assert len({service["id"] for service in paged}) == 9
+
+        # within one price, ids follow the sort direction
+        prices = [(service["effective_price"], service["id"]) for service in paged]
+        assert prices == sorted(prices, reverse=sort == "price_desc")
+
+
+def test_list_etag_follows_the_cache_key_not_the_raw_query(client, db):
+    add_priced_services(db, [100, 200, 300])
+
+    first = client.get("/admin/services/?limit=2&sort=price&min_price=0")
+    invalidate_responses("services")  # e.g. another worker, or the TTL ran out
+    # same params in another order, plus a default value written out
+    second = client.get("/admin/services/?min_price=0&sort=price&limit=2&include_total=false")
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+
+    invalidate_responses("services")
+    response = client.get(
+        "/admin/services/?sort=price&min_price=0&limit=2",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert response.status_code == 304
@@ -0,0 +1,96 @@
+# AppwriteStorage against a fake Appwrite (httpx.MockTransport), no network
+
+import asyncio
+import logging
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.deps import get_current_user
+from app.main import app
+from app.models import AdminUser
+from app.utils.storage import AppwriteStorage, get_storage
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(64)
+
+
+def make_storage(handler) -> AppwriteStorage:
+    return AppwriteStorage(
+        "https://appwrite.example.com/v1/",
+        "project-1",
+        "secret-key",
+        "bucket-1",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_create_file_sends_multipart_upload():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(201, json={"$id": "abc", "sizeOriginal": len(PNG)})
+
+    async def upload():
+        storage = make_storage(handler)
+        try:
+            return await storage.create_file(PNG, filename="logo.png", mime_type="image/png", file_id="abc")
+        finally:
+            await storage.close()
+
+    assert asyncio.run(upload()) == {"$id": "abc", "sizeOriginal": len(PNG)}
+
+    (request,) = requests
+    assert request.method == "POST"
+    assert str(request.url) == "https://appwrite.example.com/v1/storage/buckets/bucket-1/files"
+    assert request.headers["x-appwrite-project"] == "project-1"
+    assert request.headers["x-appwrite-key"] == "secret-key"
+    assert request.headers["content-type"].startswith("multipart/form-data; boundary=")
+    body = request.read()
+    assert b'name="fileId"\r\n\r\nabc\r\n' in body
+    assert b'name="file"; filename="logo.png"\r\nContent-Type: image/png\r\n\r\n' + PNG in body
+
+
+def test_create_file_raises_on_appwrite_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"message": "Invalid API key"})
+
+    async def upload():
+        storage = make_storage(handler)
+        try:
+            await storage.create_file(PNG, filename="logo.png", mime_type="image/png")
+        finally:
+            await storage.close()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(upload())
+
+
+def test_file_view_url():
+    storage = make_storage(lambda request: httpx.Response(200))
+    assert storage.file_view_url("abc") == (
+        "https://appwrite.example.com/v1/storage/buckets/bucket-1/files/abc/view?project=project-1"
+    )
+    asyncio.run(storage.close())
+
+
+def test_upload_route_turns_appwrite_errors_into_500(caplog):
+    storage = make_storage(lambda request: httpx.Response(503, text="unavailable"))
+    app.dependency_overrides[get_storage] = lambda: storage
+    app.dependency_overrides[get_current_user] = lambda: AdminUser(
+        id=1, email="admin@example.com", role="admin", is_active=True
+    )
+    try:
+        with TestClient(app) as client, caplog.at_level(logging.ERROR):
+            response = client.post(
+                "/admin/uploads/image",
+                files={"file": ("logo.png", PNG, "image/png")},
+            )
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(storage.close())
+
+    assert response.status_code == 500
+    assert "503" in response.json()["detail"]
+    assert "Failed to upload image" in caplog.text
@@ -0,0 +1,68 @@
+# Training endpoints: mentor links and the mentor delete guard
+
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+
+from app.models.training.mentor import Mentor
+from app.models.training.training import Training
+from app.models.training.training_mentor import TrainingMentor
+from app.routes.training import link_mentors
+from app.utils.query_stats import query_budget
+
+
+def add_training(db, title: str, mentor_ids: list) -> str:
+    training_id = uuid4()
+    db.execute(insert(Training), [{"id": training_id, "title": title, "base_price": 100}])
+    if mentor_ids:
+        db.execute(insert(TrainingMentor), [
+            {"training_id": training_id, "mentor_id": mentor_id, "order": order}
+            for order, mentor_id in enumerate(mentor_ids)
+        ])
+    db.commit()
+    return str(training_id)
+
+
+def test_delete_mentor_still_assigned_answers_409_with_references(client, db):
+    mentor_id = uuid4()
+    db.execute(insert(Mentor), [{"id": mentor_id, "name": "Anna"}])
+    training_ids = [add_training(db, "Rust", [mentor_id]), add_training(db, "Go", [mentor_id])]
+
+    response = client.delete(f"/admin/mentors/{mentor_id}")
+    assert response.status_code == 409
+    assert response.json()["references"] == {
+        "trainings": {"count": 2, "ids": training_ids[::-1], "titles": ["Go", "Rust"]},
+    }
+
+    db.execute(delete(TrainingMentor).where(TrainingMentor.mentor_id == mentor_id))
+    db.commit()
+    assert client.delete(f"/admin/mentors/{mentor_id}").status_code == 204
+
+
+def test_link_mentors_rejects_unknown_ids_with_one_query(db):
+    known, unknown = uuid4(), uuid4()
+    db.execute(insert(Mentor), [{"id": known, "name": "Anna"}])
+    training_id = add_training(db, "Rust", [])
+
+    with query_budget(1) as counter, pytest.raises(HTTPException) as error:
+        link_mentors(db, training_id, [known, unknown, known])
+    assert counter.count == 1  # existing_ids, no INSERT
+    assert error.value.status_code == 400
+    assert error.value.detail == f"Mentors do not exist: {unknown}"
+
+
+def test_create_training_with_unknown_mentor_saves_nothing(client, db):
+    response = client.post("/admin/trainings/", json={
+        "title": "Rust",
+        "description": None,
+        "photo_url": None,
+        "base_price": 100,
+        "discount_type": None,
+        "discount_value": None,
+        "benefits": ["Certificate"],
+        "mentor_ids": [str(uuid4())],
+    })
+    assert response.status_code == 400, response.text
+    assert db.scalar(select(func.count()).select_from(Training)) == 0